@@ -17,6 +17,7 @@ from loguru import logger
 from src.helper.config import Config
 from src.database.loader import DatabaseLoader
 from src.manager.file_manager import FileManager
+from src.controller.habbo.http.gateway import HabboGateway
 
 # Configure logger to write to a specified file
 logger.add(Config().log_file, mode="w+")
@@ -144,6 +145,8 @@ class Bot(commands.Bot):
         Closes the bot.
         """
         await super().close()
+        await DatabaseLoader().close()
+        await HabboGateway().close()
 
 
 if __name__ == "__main__":
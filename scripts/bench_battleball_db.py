@@ -0,0 +1,144 @@
+"""
+Benchmarks match ingestion, leaderboard reads and the top-users queue refresh against a
+throwaway battleball database.
+
+Usage:
+    python -m scripts.bench_battleball_db [--engine sqlite] [--users 50] [--matches 200] [--batch-size 3]
+                                          [--write-behind] [--reads 500]
+                                          [--table-sizes 1000 10000 100000]
+"""
+
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+from loguru import logger
+
+from src.database.models.battleball import Match
+from src.database.service.battleball_service import BattleballDatabaseService, ENGINES
+
+
+async def ingest(db_service, users: int, matches: int, batch_size: int) -> float:
+    """
+    Records matches in batches the way the worker does. Writes go through the
+    write-behind stage when it's enabled on the service.
+    """
+    writes = db_service.write_behind or db_service
+    start = time.perf_counter()
+    for user_idx in range(users):
+        username = f"bench_user_{user_idx}"
+        await db_service.add_user(username)
+        user_id = await db_service.get_user_id(username)
+        for batch_start in range(0, matches, batch_size):
+            batch = [
+                Match(
+                    match_id=f"match_{user_idx}_{match_idx}",
+                    user_id=user_id,
+                    game_score=random.randint(0, 500),
+                    ranked=random.random() < 0.8
+                )
+                for match_idx in range(batch_start, min(batch_start + batch_size, matches))
+            ]
+            await writes.record_matches(user_id, batch)
+    await db_service.flush_writes()
+    return time.perf_counter() - start
+
+
+async def read_leaderboard(db_service, reads: int) -> list:
+    timings = []
+    for _ in range(reads):
+        start = time.perf_counter()
+        await db_service.get_leaderboard(limit=10)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def seed_users(db_service, seeded: int, total: int):
+    users = [(f"seed_user_{seeded + idx}", random.randint(0, 1_000_000)) for idx in range(total)]
+    if db_service.engine != "sqlite":
+        for username, score in users:
+            await db_service.add_user(username)
+            user_id = await db_service.get_user_id(username)
+            await db_service.record_matches(user_id, [Match(match_id="seed", user_id=user_id, game_score=score, ranked=True)])
+        return
+
+    async with db_service.pool.transaction() as db:
+        await db.executemany(
+            "INSERT OR IGNORE INTO users (username, total_score, ranked_matches) VALUES (?, ?, 1)", users)
+    # Fold the seed rows into the main file so the timings don't include a large WAL
+    await db_service.pool.reader().execute_fetchall("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+async def clear_queue(db_service):
+    for queue_id, _, _ in await db_service.seek_queue(-1):
+        await db_service.remove_from_queue(queue_id)
+
+
+async def enqueue_top_users(db_service, rounds: int = 20) -> tuple:
+    """
+    Times the periodic top-45 refresh the old way (whole leaderboard, one add_to_queue
+    per user) and the bulk way (LIMIT 45, one bulk_add_to_queue call).
+    """
+    per_user, bulk = [], []
+    for _ in range(rounds):
+        await clear_queue(db_service)
+        start = time.perf_counter()
+        leaderboard = await db_service.get_leaderboard()
+        for username, _, _ in leaderboard[:45]:
+            await db_service.add_to_queue(username, 0)
+        per_user.append((time.perf_counter() - start) * 1000)
+
+    for _ in range(rounds):
+        await clear_queue(db_service)
+        start = time.perf_counter()
+        top_users = await db_service.get_leaderboard(limit=45)
+        await db_service.bulk_add_to_queue([username for username, _, _ in top_users], 0)
+        bulk.append((time.perf_counter() - start) * 1000)
+
+    await clear_queue(db_service)
+    return statistics.median(per_user), statistics.median(bulk)
+
+
+async def main(args):
+    logger.remove()  # keep the service's debug logging out of the timings
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_service = BattleballDatabaseService(os.path.join(tmp_dir, "bench.db"), args.engine)
+        await db_service.initialize()
+        if args.write_behind:
+            await db_service.enable_write_behind(1000, 200, 250)
+
+        commits_before = db_service.pool.commits if args.engine == "sqlite" else 0
+        elapsed = await ingest(db_service, args.users, args.matches, args.batch_size)
+        total = args.users * args.matches
+        commits = f", {db_service.pool.commits - commits_before} commits" if args.engine == "sqlite" else ""
+        print(f"Ingestion ({args.engine}): {total} matches in {elapsed:.2f}s ({total / elapsed:.0f} matches/s{commits})")
+
+        timings = sorted(await read_leaderboard(db_service, args.reads))
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        print(f"Leaderboard (limit=10): mean {statistics.mean(timings):.3f}ms, "
+              f"p50 {statistics.median(timings):.3f}ms, p99 {p99:.3f}ms over {args.reads} reads")
+
+        seeded = 0
+        for size in args.table_sizes:
+            await seed_users(db_service, seeded, size - seeded)
+            seeded = size
+            per_user, bulk = await enqueue_top_users(db_service)
+            print(f"Top-45 enqueue with {size} users: per-user {per_user:.2f}ms, bulk {bulk:.2f}ms (median)")
+
+        await db_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--matches", type=int, default=200)
+    parser.add_argument("--engine", choices=ENGINES, default="sqlite")
+    parser.add_argument("--batch-size", type=int, default=3, help="matches per record_matches call")
+    parser.add_argument("--write-behind", action="store_true", help="route ingestion through the write-behind stage")
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--table-sizes", type=int, nargs="*", default=[1000, 10000, 100000])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,168 @@
+"""
+Benchmarks match fetches against a local TLS stand-in of the Habbo API, comparing a
+new httpx client per request with the long-lived pooled clients HabboGateway uses.
+With --window, also compares the worker's old lockstep batches with a sliding window of
+that many requests in flight, against a stand-in with --jitter-ms of long-tail latency.
+With --server-rate, also compares fixed one-second retry sleeps with the adaptive rate
+limiter against a stand-in that answers 429 past that many requests per second.
+
+Usage:
+    python -m scripts.bench_habbo_http [--requests 600] [--batch-size 3] [--latency-ms 0] [--no-http2]
+                                       [--window 5] [--jitter-ms 50]
+                                       [--server-rate 20] [--throttled-requests 400]
+"""
+
+import time
+import asyncio
+import argparse
+
+import httpx
+from loguru import logger
+
+from scripts.habbo_stand_in import StandInServer
+from src.controller.habbo.http.client_pool import HttpClientPool
+from src.utils.async_utils import sliding_window
+from src.controller.habbo.http.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+MAX_ATTEMPTS = 5  # Same as HabboGateway
+
+
+async def fetch_per_request(server: StandInServer, match_ids: list, batch_size: int) -> float:
+    """
+    The old way: every fetch opens its own client, so every fetch handshakes.
+    """
+    async def fetch(match_id: str):
+        async with httpx.AsyncClient(timeout=10.0, verify=server.ssl_context) as client:
+            response = await client.get(f"{server.base_url}/matches/v1/{match_id}")
+            response.raise_for_status()
+            return response.json()
+
+    start = time.perf_counter()
+    for idx in range(0, len(match_ids), batch_size):
+        await asyncio.gather(*(fetch(match_id) for match_id in match_ids[idx:idx + batch_size]))
+    return time.perf_counter() - start
+
+
+async def fetch_pooled(server: StandInServer, match_ids: list, batch_size: int, http2: bool) -> float:
+    clients = HttpClientPool(timeout=10.0, http2=http2, verify=server.ssl_context)
+
+    async def fetch(match_id: str):
+        response = await clients.get(None).get(f"{server.base_url}/matches/v1/{match_id}")
+        response.raise_for_status()
+        return response.json()
+
+    start = time.perf_counter()
+    for idx in range(0, len(match_ids), batch_size):
+        await asyncio.gather(*(fetch(match_id) for match_id in match_ids[idx:idx + batch_size]))
+    elapsed = time.perf_counter() - start
+    await clients.aclose()
+    return elapsed
+
+
+async def fetch_windowed(server: StandInServer, match_ids: list, window: int) -> float:
+    clients = HttpClientPool(timeout=10.0, verify=server.ssl_context)
+
+    async def fetch(match_id: str):
+        response = await clients.get(None).get(f"{server.base_url}/matches/v1/{match_id}")
+        response.raise_for_status()
+        return response.json()
+
+    start = time.perf_counter()
+    async for _ in sliding_window(fetch, match_ids, window):
+        pass
+    elapsed = time.perf_counter() - start
+    await clients.aclose()
+    return elapsed
+
+
+async def fetch_throttled(server: StandInServer, match_ids: list, batch_size: int, limiter=None) -> tuple:
+    """
+    Fetches every match through a rate-limited stand-in. Without a limiter, a 429 is
+    retried after a fixed one-second sleep, the way HabboApiClient used to. With one,
+    every attempt waits for a token and the limiter learns from each response.
+    Returns (elapsed seconds, matches fetched, 429s received).
+    """
+    clients = HttpClientPool(timeout=10.0, verify=server.ssl_context)
+    throttled = 0
+
+    async def fetch(match_id: str) -> bool:
+        nonlocal throttled
+        for _ in range(MAX_ATTEMPTS):
+            if limiter:
+                await limiter.acquire()
+            response = await clients.get(None).get(f"{server.base_url}/matches/v1/{match_id}")
+            if response.status_code != 429:
+                if limiter:
+                    limiter.on_success()
+                return True
+
+            throttled += 1
+            if limiter:
+                limiter.on_throttled(parse_retry_after(response.headers.get("Retry-After")))
+            else:
+                await asyncio.sleep(1)
+        return False
+
+    start = time.perf_counter()
+    fetched = 0
+    for idx in range(0, len(match_ids), batch_size):
+        results = await asyncio.gather(*(fetch(match_id) for match_id in match_ids[idx:idx + batch_size]))
+        fetched += sum(results)
+    elapsed = time.perf_counter() - start
+    await clients.aclose()
+    return elapsed, fetched, throttled
+
+
+async def main(args):
+    logger.remove()
+    match_ids = [f"bouncer-bench:{idx}" for idx in range(args.requests)]
+    with StandInServer(args.port, latency_ms=args.latency_ms) as server:
+        # One throwaway round so both modes start with a warm server
+        await fetch_pooled(server, match_ids[:args.batch_size], args.batch_size, not args.no_http2)
+
+        elapsed = await fetch_per_request(server, match_ids, args.batch_size)
+        print(f"New client per request: {args.requests} requests in {elapsed:.2f}s "
+              f"({args.requests / elapsed:.0f} req/s)")
+
+        elapsed = await fetch_pooled(server, match_ids, args.batch_size, not args.no_http2)
+        print(f"Pooled keep-alive client: {args.requests} requests in {elapsed:.2f}s "
+              f"({args.requests / elapsed:.0f} req/s)")
+
+    if args.window:
+        with StandInServer(args.port + 2, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms) as server:
+            elapsed = await fetch_pooled(server, match_ids, args.batch_size, not args.no_http2)
+            print(f"Lockstep batches of {args.batch_size} ({args.jitter_ms:g}ms mean jitter): {args.requests} requests "
+                  f"in {elapsed:.2f}s ({args.requests / elapsed:.0f} req/s)")
+            for window in sorted({args.batch_size, args.window}):
+                elapsed = await fetch_windowed(server, match_ids, window)
+                print(f"Sliding window of {window} ({args.jitter_ms:g}ms mean jitter): {args.requests} requests "
+                      f"in {elapsed:.2f}s ({args.requests / elapsed:.0f} req/s)")
+
+    if not args.server_rate:
+        return
+
+    match_ids = [f"bouncer-bench:{idx}" for idx in range(args.throttled_requests)]
+    for name, limiter in (
+        ("Fixed 1s retry sleeps", None),
+        ("Adaptive rate limiter", AdaptiveRateLimiter(rate=5, max_rate=args.server_rate * 4)),
+    ):
+        # A fresh stand-in per run so both start with a full server-side bucket
+        with StandInServer(args.port + 1, latency_ms=args.latency_ms, rate_limit=args.server_rate) as server:
+            elapsed, fetched, throttled = await fetch_throttled(server, match_ids, args.batch_size, limiter)
+        print(f"{name} (server limit {args.server_rate:g} req/s): {fetched}/{len(match_ids)} matches in "
+              f"{elapsed:.2f}s ({fetched / elapsed * 60:.0f} matches/min), {throttled} 429s"
+              + (f", settled at {limiter.rate:.1f} req/s" if limiter else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--batch-size", type=int, default=3, help="concurrent fetches, like the worker's batches")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay the stand-in adds to every response")
+    parser.add_argument("--no-http2", action="store_true", help="keep the pooled client on HTTP/1.1")
+    parser.add_argument("--window", type=int, default=0, help="requests in flight for the sliding-window comparison")
+    parser.add_argument("--jitter-ms", type=float, default=50, help="mean long-tail delay for the sliding-window comparison")
+    parser.add_argument("--server-rate", type=float, default=0, help="stand-in rate limit for the throttling comparison")
+    parser.add_argument("--throttled-requests", type=int, default=400)
+    parser.add_argument("--port", type=int, default=8443)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,279 @@
+"""
+A local stand-in for the public Habbo Origins API, served over TLS with a throwaway
+self-signed certificate. It answers the user, match ID and match endpoints the
+battleball worker calls with deterministic synthetic data, so HTTP client and worker
+changes can be benchmarked without touching the real API.
+
+Usage:
+    python -m scripts.habbo_stand_in [--port 8443] [--players 0] [--matches 250]
+                                     [--latency-ms 0] [--jitter-ms 0] [--latency-dist exponential]
+                                     [--rate-limit 0] [--error-rate 0] [--throttle-rate 0]
+                                     [--outage-after 0] [--outage-seconds 0]
+"""
+
+import os
+import ssl
+import math
+import time
+import zlib
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+
+API_PREFIX = "/api/public"
+LATENCY_DISTRIBUTIONS = ("exponential", "lognormal")
+
+
+def match_score(match_id: str) -> int:
+    return zlib.crc32(match_id.encode()) % 500
+
+
+def player_name(idx: int) -> str:
+    return f"player{idx}"
+
+
+def extra_latency_ms(jitter_ms: float, distribution: str) -> float:
+    """
+    Draws the extra delay of one response, averaging `jitter_ms`. Exponential gives a
+    moderate tail, lognormal (sigma 1) a heavier one with rare very slow responses.
+    """
+    if not jitter_ms:
+        return 0
+    if distribution == "lognormal":
+        return random.lognormvariate(math.log(jitter_ms) - 0.5, 1)
+    return random.expovariate(1 / jitter_ms)
+
+
+def create_app(
+    matches_per_user: int = 250, latency_ms: float = 0, rate_limit: float = 0, jitter_ms: float = 0,
+    players: int = 0, latency_dist: str = "exponential", error_rate: float = 0, throttle_rate: float = 0,
+    outage_after: float = 0, outage_seconds: float = 0
+) -> FastAPI:
+    """
+    Builds the stand-in app. With `players` the hotel has that many users, named
+    `player0` onwards, and other names get a 404; without it every username exists.
+    Each user has `matches_per_user` matches against opponents drawn from the roster.
+
+    Every response is delayed by `latency_ms` plus an extra averaging `jitter_ms`
+    drawn from `latency_dist`, which gives the long tail real responses have. A share
+    `error_rate` of requests fails with a 500 and a share `throttle_rate` gets a 429
+    with a Retry-After. With a `rate_limit`, requests beyond that many per second
+    also get a 429, like the real API does under load. With `outage_seconds`, every
+    request gets a 503 for that long, starting `outage_after` seconds after the app
+    is built.
+    """
+    if latency_dist not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown latency distribution '{latency_dist}', expected one of {LATENCY_DISTRIBUTIONS}")
+
+    app = FastAPI()
+    app.state.requests = 0
+    app.state.throttled = 0
+    app.state.errors = 0
+    app.state.outage_requests = 0
+    created_at = time.monotonic()
+    bucket = {"tokens": rate_limit, "updated_at": time.monotonic()}
+
+    def throttle():
+        app.state.throttled += 1
+        return JSONResponse({"error": "Too many requests"}, status_code=429, headers={"Retry-After": "1"})
+
+    @app.middleware("http")
+    async def simulate_load(request, call_next):
+        app.state.requests += 1
+        if outage_seconds and outage_after <= time.monotonic() - created_at < outage_after + outage_seconds:
+            app.state.outage_requests += 1
+            return JSONResponse({"error": "Service unavailable"}, status_code=503)
+
+        if rate_limit:
+            now = time.monotonic()
+            bucket["tokens"] = min(bucket["tokens"] + (now - bucket["updated_at"]) * rate_limit, rate_limit)
+            bucket["updated_at"] = now
+            if bucket["tokens"] < 1:
+                return throttle()
+            bucket["tokens"] -= 1
+
+        delay = latency_ms + extra_latency_ms(jitter_ms, latency_dist)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        roll = random.random()
+        if roll < throttle_rate:
+            return throttle()
+        if roll < throttle_rate + error_rate:
+            app.state.errors += 1
+            return JSONResponse({"error": "Internal server error"}, status_code=500)
+        return await call_next(request)
+
+    def opponent_of(match_id: str) -> str:
+        if not players:
+            return "bouncer-opponent"
+        return f"bouncer-{player_name(zlib.crc32(match_id.encode()) % players)}"
+
+    @app.get(f"{API_PREFIX}/users")
+    async def get_user(name: str):
+        if players and not (name.startswith("player") and name[6:].isdigit() and int(name[6:]) < players):
+            raise HTTPException(status_code=404, detail="User not found")
+        return {"uniqueId": f"hhus-{name}", "name": name, "bouncerPlayerId": f"bouncer-{name}"}
+
+    @app.get(f"{API_PREFIX}/matches/v1/{{bouncer_player_id}}/ids")
+    async def get_match_ids(bouncer_player_id: str, offset: int = 0, limit: int = 100):
+        if not bouncer_player_id.startswith("bouncer-"):
+            raise HTTPException(status_code=404, detail="Player not found")
+        # Newest first, like the real endpoint
+        newest = matches_per_user - 1 - offset
+        return [f"{bouncer_player_id}:{idx}" for idx in range(newest, max(newest - limit, -1), -1)]
+
+    @app.get(f"{API_PREFIX}/matches/v1/{{match_id}}")
+    async def get_match(match_id: str):
+        bouncer_player_id, _, idx = match_id.rpartition(":")
+        if not bouncer_player_id or not idx.isdigit():
+            raise HTTPException(status_code=404, detail="Match not found")
+        participants = [
+            {
+                "gamePlayerId": player_id,
+                "gameScore": match_score(f"{match_id}/{player_id}"),
+                "playerPlacement": placement,
+                "teamId": placement,
+                "teamPlacement": placement,
+                "timesStunned": 0,
+                "powerUpPickups": 0,
+                "powerUpActivations": 0,
+                "tilesCleaned": 0,
+                "tilesColoured": 0,
+                "tilesStolen": 0,
+                "tilesLocked": 0,
+                "tilesColouredForOpponents": 0,
+            }
+            for placement, player_id in enumerate((bouncer_player_id, opponent_of(match_id)), start=1)
+        ]
+        game_end = 1_700_000_000_000 + int(idx) * 300_000
+        return {
+            "metadata": {"matchId": match_id, "participantPlayerIds": [p["gamePlayerId"] for p in participants]},
+            "info": {
+                "gameCreation": game_end - 180_000,
+                "gameDuration": 180,
+                "gameEnd": game_end,
+                "gameMode": "BATTLEBALL",
+                "mapId": 1,
+                "ranked": int(idx) % 5 != 0,
+                "participants": participants,
+            },
+        }
+
+    return app
+
+
+def create_certificate(directory: str) -> tuple:
+    """
+    Writes a self-signed certificate for 127.0.0.1 and localhost with openssl.
+    Returns (certfile, keyfile).
+    """
+    certfile, keyfile = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", keyfile, "-out", certfile, "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost",
+        ],
+        check=True,
+        capture_output=True
+    )
+    return certfile, keyfile
+
+
+class StandInServer:
+    """
+    Runs the stand-in app on a background thread with its own event loop.
+
+    Attributes:
+        base_url (str): The URL to use in place of HabboGateway.api_url.
+        ssl_context (ssl.SSLContext): A client context that trusts the throwaway certificate.
+
+    Keyword arguments are passed on to `create_app`.
+    """
+
+    def __init__(self, port: int = 8443, **options):
+        self.port = port
+        self.app = create_app(**options)
+        self.base_url = f"https://127.0.0.1:{port}{API_PREFIX}"
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.certfile, self.keyfile = create_certificate(self._tmp_dir.name)
+        self.ssl_context = ssl.create_default_context(cafile=self.certfile)
+        self._server = uvicorn.Server(uvicorn.Config(
+            self.app,
+            host="127.0.0.1",
+            port=port,
+            ssl_certfile=self.certfile,
+            ssl_keyfile=self.keyfile,
+            log_level="warning"
+        ))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def requests(self) -> int:
+        return self.app.state.requests
+
+    @property
+    def throttled(self) -> int:
+        return self.app.state.throttled
+
+    @property
+    def errors(self) -> int:
+        return self.app.state.errors
+
+    @property
+    def outage_requests(self) -> int:
+        return self.app.state.outage_requests
+
+    def __enter__(self):
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *_):
+        self._server.should_exit = True
+        self._thread.join()
+        self._tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--players", type=int, default=0, help="users in the hotel, 0 lets every name exist")
+    parser.add_argument("--matches", type=int, default=250, help="matches per user")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="mean of a random extra delay")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="exponential")
+    parser.add_argument("--rate-limit", type=float, default=0, help="requests per second before answering 429")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of requests answered with a 500")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="share of requests answered with a 429")
+    parser.add_argument("--outage-after", type=float, default=0, help="seconds before the simulated outage starts")
+    parser.add_argument("--outage-seconds", type=float, default=0, help="length of a simulated outage answering 503")
+    args = parser.parse_args()
+
+    with StandInServer(
+        args.port,
+        players=args.players,
+        matches_per_user=args.matches,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        latency_dist=args.latency_dist,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        outage_after=args.outage_after,
+        outage_seconds=args.outage_seconds
+    ) as server:
+        print(f"Serving the Habbo API stand-in at {server.base_url} (certificate: {server.certfile})")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,149 @@
+"""
+Drives BattleballWorker end to end against the local Habbo API stand-in and a throwaway
+battleball database: queues every player of the synthetic hotel, runs the worker until
+the queue is empty and reports matches stored per second, per-endpoint request latency
+percentiles, per-lane queue waits and database commits. With --interactive-rate, /keko
+style user lookups run alongside the worker in the interactive lane. With
+--outage-seconds, the stand-in answers 503 for a while and the report shows how many
+requests the outage cost.
+
+Usage:
+    python -m scripts.load_habbo_worker [--players 20] [--matches 250] [--engine sqlite] [--write-behind]
+                                        [--latency-ms 20] [--jitter-ms 30] [--latency-dist exponential]
+                                        [--rate-limit 0] [--error-rate 0] [--throttle-rate 0]
+                                        [--client-rate 50] [--hedge]
+                                        [--lane periodic] [--interactive-rate 0]
+                                        [--outage-after 0] [--outage-seconds 0] [--circuit-cooldown 2] [--no-breaker]
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+
+from loguru import logger
+
+from scripts.habbo_stand_in import StandInServer, LATENCY_DISTRIBUTIONS, player_name
+from src.controller.habbo.http.gateway import HabboGateway
+from src.controller.habbo.http.lanes import LANES, PERIODIC
+from src.controller.habbo.battleball.worker.worker import BattleballWorker
+from src.database.service.battleball_service import BattleballDatabaseService, ENGINES
+from src.database.service.match_payload_store import MatchPayloadStore
+
+
+async def look_up_users(gateway: HabboGateway, players: int, rate: float):
+    """
+    Sends uncached user lookups at `rate` per second, like /keko commands, until cancelled.
+    """
+    idx = 0
+    while True:
+        asyncio.create_task(gateway.get("users", f"{gateway.api_url}/users", {"name": player_name(idx % players)}))
+        idx += 1
+        await asyncio.sleep(1 / rate)
+
+
+async def run(args, server: StandInServer, db_path: str):
+    db_service = BattleballDatabaseService(db_path, args.engine)
+    gateway = HabboGateway()
+    try:
+        await db_service.initialize()
+        if args.write_behind:
+            await db_service.enable_write_behind(1000, 200, 250)
+
+        gateway.api_url = server.base_url
+        gateway.clients.verify = server.ssl_context
+        if args.client_rate:
+            gateway.rate_limiter.rate = args.client_rate
+            gateway.rate_limiter.max_rate = max(gateway.rate_limiter.max_rate, args.client_rate)
+        gateway.config.habbo_api_hedging = args.hedge
+        gateway.config.habbo_circuit_cooldown_seconds = args.circuit_cooldown
+        if args.no_breaker:
+            gateway.config.habbo_circuit_failure_threshold = float("inf")
+
+        usernames = [player_name(idx) for idx in range(args.players)]
+        await db_service.bulk_add_to_queue(usernames, 0, lane=args.lane)
+        await db_service.flush_writes()
+
+        # DMs are never delivered without a bot, the worker only logs the failure
+        worker = BattleballWorker(None)
+        commits_before = db_service.pool.commits if args.engine == "sqlite" else 0
+        lookups = asyncio.create_task(look_up_users(gateway, args.players, args.interactive_rate)) \
+            if args.interactive_rate else None
+        start = time.perf_counter()
+        await worker.start()
+        await db_service.flush_writes()
+        elapsed = time.perf_counter() - start
+        if lookups:
+            lookups.cancel()
+
+        stored = 0
+        for username in usernames:
+            user_id = await db_service.get_user_id(username)
+            if user_id:
+                stored += len(await db_service.get_match_ids(user_id))
+
+        print(f"Worker ({args.engine}{', write-behind' if args.write_behind else ''}): {stored}/{args.players * args.matches} "
+              f"matches for {args.players} players in {elapsed:.2f}s ({stored / elapsed:.0f} matches/s)")
+        if args.engine == "sqlite":
+            print(f"Database commits: {db_service.pool.commits - commits_before}")
+        print(f"Stand-in: {server.requests} requests, {server.throttled} answered 429, {server.errors} answered 500, "
+              f"{server.outage_requests} sent during the outage")
+        breaker = gateway.api_breaker
+        print(f"Circuit: {breaker.rejected} requests held back, {len(await db_service.get_queue())} jobs left in the queue")
+        for endpoint, metrics in gateway.get_stats().items():
+            print(f"  {endpoint}: {metrics['requests']} requests, {metrics['errors']} errors, "
+                  f"{metrics['hedges']} hedged ({metrics['hedge_wins']} won), "
+                  f"p50 {metrics['p50_latency_ms']}ms, p99 {metrics['p99_latency_ms']}ms")
+        for lane, metrics in gateway.lanes.get_stats().items():
+            if metrics["granted"]:
+                print(f"  {lane} lane: {metrics['granted']} requests, "
+                      f"wait p50 {metrics['p50_wait_ms']}ms, p95 {metrics['p95_wait_ms']}ms")
+        print(f"Client rate limiter settled at {gateway.rate_limiter.rate:.1f} req/s")
+    finally:
+        await db_service.close()
+        await MatchPayloadStore().close()
+        await gateway.close()
+
+
+async def main(args):
+    logger.remove()  # keep the worker's per-match logging out of the timings
+    with StandInServer(
+        args.port,
+        players=args.players,
+        matches_per_user=args.matches,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        latency_dist=args.latency_dist,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        outage_after=args.outage_after,
+        outage_seconds=args.outage_seconds
+    ) as server, tempfile.TemporaryDirectory() as tmp_dir:
+        await run(args, server, os.path.join(tmp_dir, "load.db"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--players", type=int, default=20, help="players queued for the worker")
+    parser.add_argument("--matches", type=int, default=250, help="matches per player")
+    parser.add_argument("--engine", choices=ENGINES, default="sqlite")
+    parser.add_argument("--write-behind", action="store_true", help="route worker writes through the write-behind stage")
+    parser.add_argument("--latency-ms", type=float, default=20, help="delay the stand-in adds to every response")
+    parser.add_argument("--jitter-ms", type=float, default=30, help="mean of a random extra delay")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="exponential")
+    parser.add_argument("--rate-limit", type=float, default=0, help="stand-in requests per second before answering 429")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of stand-in requests answered with a 500")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="share of stand-in requests answered with a 429")
+    parser.add_argument("--client-rate", type=float, default=50,
+                        help="starting rate of the client's limiter, 0 keeps the configured habbo_api_rate")
+    parser.add_argument("--hedge", action="store_true", help="duplicate slow match fetches, see habbo_api_hedging")
+    parser.add_argument("--lane", choices=LANES, default=PERIODIC, help="lane the queued jobs run in")
+    parser.add_argument("--interactive-rate", type=float, default=0, help="/keko style lookups per second during the run")
+    parser.add_argument("--outage-after", type=float, default=0, help="seconds into the run the stand-in goes down")
+    parser.add_argument("--outage-seconds", type=float, default=0, help="length of the stand-in outage")
+    parser.add_argument("--circuit-cooldown", type=float, default=2, help="seconds before the first probe")
+    parser.add_argument("--no-breaker", action="store_true", help="never open the circuit, for comparison")
+    parser.add_argument("--port", type=int, default=8443)
+    asyncio.run(main(parser.parse_args()))
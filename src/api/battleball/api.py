@@ -8,6 +8,7 @@ from fastapi import FastAPI, HTTPException, Query
 from src.helper.singleton import Singleton
 from fastapi.middleware.cors import CORSMiddleware
 from src.utils.time_utils import UpdateTimer
+from src.utils.pagination_utils import encode_cursor, decode_cursor
 from src.database.service.battleball_service import BattleballDatabaseService
 
 
@@ -17,6 +18,8 @@ class BattleballAPI:
     A class to encapsulate the FastAPI application for Battleball.
     """
 
+    DEFAULT_PER_PAGE = 50  # Page size for cursor requests that don't set per_page
+
     def __init__(self, bot: commands.Bot):
         """
         Initializes the BattleballAPI class, setting up the FastAPI app and database service.
@@ -56,62 +59,84 @@ class BattleballAPI:
         @self.app.get("/leaderboard")
         async def get_leaderboard(
             page: int = Query(None, ge=1, description="Page number"),
-            per_page: int = Query(None, ge=1, le=100, description="Items per page")
+            per_page: int = Query(None, ge=1, le=100, description="Items per page"),
+            cursor: str = Query(None, description="The next_cursor of a previous page")
         ):
             """
             Fetches the leaderboard from the database and returns it as JSON.
-            If page and per_page are not provided, returns the entire leaderboard.
+            If cursor is provided, returns the page right after it (keyset pagination).
+            If page and per_page are provided, returns that page.
+            Otherwise, returns the entire leaderboard.
 
             Args:
                 page (int, optional): The page number
                 per_page (int, optional): The number of items per page (max: 100)
+                cursor (str, optional): The next_cursor returned with the previous page
 
             Returns:
                 dict: A dictionary containing the leaderboard and metadata.
             """
-            if page is None or per_page is None:
+            next_cursor = None
+            page_size = per_page
+
+            if cursor is not None:
+                # Return the page after the cursor
+                try:
+                    after_score, after_id, offset = decode_cursor(cursor, 3)
+                except ValueError:
+                    logger.warning(f"Invalid leaderboard cursor '{cursor}'")
+                    raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+                page_size = per_page or self.DEFAULT_PER_PAGE
+                leaderboard = await self.db_service.seek_leaderboard(page_size + 1, after=(after_score, after_id))
+            elif page is None or per_page is None:
                 # Return the entire leaderboard
-                leaderboard = await self.db_service.get_leaderboard()
+                offset = 0
+                page_size = None
+                leaderboard = await self.db_service.seek_leaderboard(-1)
                 total_users = len(leaderboard)
-                formatted_leaderboard = [
-                    {
-                        "position": idx + 1,
-                        "username": username,
-                        "total_score": score,
-                        "ranked_matches": ranked_matches
-                    }
-                    for idx, (username, score, ranked_matches) in enumerate(leaderboard)
-                ]
             else:
                 # Return paginated leaderboard
                 offset = (page - 1) * per_page
-                leaderboard = await self.db_service.get_leaderboard(limit=per_page, offset=offset)
+                leaderboard = await self.db_service.seek_leaderboard(per_page + 1, offset=offset)
                 total_users = await self.db_service.get_total_users()
-                formatted_leaderboard = [
-                    {
-                        "position": offset + idx + 1,
-                        "username": username,
-                        "total_score": score,
-                        "ranked_matches": ranked_matches
-                    }
-                    for idx, (username, score, ranked_matches) in enumerate(leaderboard)
-                ]
+
+            if page_size is not None and len(leaderboard) > page_size:
+                # The extra row only tells whether there is a next page
+                leaderboard = leaderboard[:page_size]
+                last_id, _, last_score, _ = leaderboard[-1]
+                next_cursor = encode_cursor(last_score, last_id, offset + page_size)
 
             if not leaderboard:
                 logger.warning("Leaderboard not found")
                 raise HTTPException(status_code=404, detail="Leaderboard not found")
 
+            formatted_leaderboard = [
+                {
+                    "position": offset + idx + 1,
+                    "username": username,
+                    "total_score": score,
+                    "ranked_matches": ranked_matches
+                }
+                for idx, (_, username, score, ranked_matches) in enumerate(leaderboard)
+            ]
+
             response = {
                 "leaderboard": formatted_leaderboard,
-                "metadata": {
-                    "total_users": total_users,
-                },
+                "metadata": {},
+                "next_cursor": next_cursor,
                 "next_update_in": max(0, round(self.update_timer.get_next_update_time())),
                 "update_interval_minutes": self.config.battleball_api_update_interval_minutes,
                 "update_interval_seconds": self.config.battleball_api_update_interval_seconds
             }
 
-            if page is not None and per_page is not None:
+            if cursor is not None:
+                # Counting every row would cost as much as the offset walk the cursor avoids
+                response["metadata"]["per_page"] = page_size
+            else:
+                response["metadata"]["total_users"] = total_users
+
+            if cursor is None and page is not None and per_page is not None:
                 total_pages = (total_users + per_page - 1) // per_page
                 response["metadata"].update({
                     "page": page,
@@ -125,55 +150,77 @@ class BattleballAPI:
         @self.app.get("/queue")
         async def get_queue(
             page: int = Query(None, ge=1, description="Page number"),
-            per_page: int = Query(None, ge=1, le=100, description="Items per page")
+            per_page: int = Query(None, ge=1, le=100, description="Items per page"),
+            cursor: str = Query(None, description="The next_cursor of a previous page")
         ):
             """
             Fetches the queue from the database and returns it as JSON.
-            If page and per_page are not provided, returns the entire queue.
+            If cursor is provided, returns the page right after it (keyset pagination).
+            If page and per_page are provided, returns that page.
+            Otherwise, returns the entire queue.
 
             Args:
                 page (int, optional): The page number
                 per_page (int, optional): The number of items per page (max: 100)
+                cursor (str, optional): The next_cursor returned with the previous page
 
             Returns:
                 dict: A dictionary containing the queue and metadata.
             """
-            if page is None or per_page is None:
+            next_cursor = None
+            page_size = per_page
+
+            if cursor is not None:
+                # Return the page after the cursor
+                try:
+                    after_id, offset = decode_cursor(cursor, 2)
+                except ValueError:
+                    logger.warning(f"Invalid queue cursor '{cursor}'")
+                    raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+                page_size = per_page or self.DEFAULT_PER_PAGE
+                queue = await self.db_service.seek_queue(page_size + 1, after=after_id)
+            elif page is None or per_page is None:
                 # Return the entire queue
-                queue = await self.db_service.get_queue(include_discord_id=False)
+                offset = 0
+                page_size = None
+                queue = await self.db_service.seek_queue(-1)
                 total_users = len(queue)
-                formatted_queue = [
-                    {
-                        "position": item["position"],
-                        "username": item["username"]
-                    }
-                    for item in queue
-                ]
             else:
                 # Return paginated queue
                 offset = (page - 1) * per_page
-                queue = await self.db_service.get_queue(limit=per_page, offset=offset, include_discord_id=False)
+                queue = await self.db_service.seek_queue(per_page + 1, offset=offset)
                 total_users = await self.db_service.get_total_queue_users()
-                formatted_queue = [
-                    {
-                        "position": item["position"],
-                        "username": item["username"]
-                    }
-                    for item in queue
-                ]
+
+            if page_size is not None and len(queue) > page_size:
+                # The extra row only tells whether there is a next page
+                queue = queue[:page_size]
+                next_cursor = encode_cursor(queue[-1][0], offset + page_size)
 
             if not queue:
                 logger.warning("Queue is empty")
                 raise HTTPException(status_code=404, detail="Queue is empty")
 
+            formatted_queue = [
+                {
+                    "position": offset + idx + 1,
+                    "username": username
+                }
+                for idx, (_, username, _) in enumerate(queue)
+            ]
+
             response = {
                 "queue": formatted_queue,
-                "metadata": {
-                    "total_users": total_users,
-                },
+                "metadata": {},
+                "next_cursor": next_cursor,
             }
 
-            if page is not None and per_page is not None:
+            if cursor is not None:
+                response["metadata"]["per_page"] = page_size
+            else:
+                response["metadata"]["total_users"] = total_users
+
+            if cursor is None and page is not None and per_page is not None:
                 total_pages = (total_users + per_page - 1) // per_page
                 response["metadata"].update({
                     "page": page,
@@ -0,0 +1,143 @@
+"""
+This module contains the Proxies cog for the Discord bot.
+
+The Proxies cog provides functionality to inspect the health of the proxies
+used for Habbo API requests.
+"""
+
+import discord
+from loguru import logger
+from tabulate import tabulate
+from discord.ext import commands
+from discord import app_commands
+
+from src.controller.habbo.http.gateway import HabboGateway
+
+
+class Proxies(commands.Cog):
+    """
+    A Discord bot cog for inspecting the Habbo API proxy pool.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+        gateway (HabboGateway): The Habbo HTTP gateway owning the proxy pool.
+    """
+
+    MAX_LISTED_PROXIES = 20  # Keeps the table within Discord's message limit
+
+    def __init__(self, bot: commands.Bot):
+        """
+        Initializes the Proxies cog with a bot instance.
+
+        Args:
+            bot (commands.Bot): The bot instance.
+        """
+        self.bot = bot
+        self.gateway = HabboGateway()
+
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.command(
+        name="proxies",
+        description="Command to show the health of the Habbo API proxies."
+    )
+    async def proxies_command(self, interaction: discord.Interaction):
+        """
+        Command to show the health of the Habbo API proxies.
+
+        Args:
+            interaction (discord.Interaction): The interaction object.
+        """
+        stats = self.gateway.proxies.get_stats()
+        ejected = sum(1 for proxy in stats if proxy["ejected_for"])
+
+        rows = [
+            (
+                proxy["proxy"],
+                proxy["latency_ms"] if proxy["latency_ms"] is not None else "-",
+                f"{proxy['error_rate']:.0%}",
+                proxy["requests"],
+                f"{proxy['ejected_for']:.0f}s" if proxy["ejected_for"] else "-",
+            )
+            for proxy in stats[:self.MAX_LISTED_PROXIES]
+        ]
+        table = tabulate(rows, headers=["Proxy", "Latency (ms)", "Errors", "Requests", "Ejected"], tablefmt="simple")
+
+        endpoints = tabulate(
+            [
+                (
+                    endpoint,
+                    metrics["requests"],
+                    metrics["errors"],
+                    metrics["throttled"],
+                    f"{metrics['hedge_wins']}/{metrics['hedges']}",
+                    metrics["p50_latency_ms"] if metrics["p50_latency_ms"] is not None else "-",
+                    metrics["p99_latency_ms"] if metrics["p99_latency_ms"] is not None else "-",
+                )
+                for endpoint, metrics in self.gateway.get_stats().items()
+            ],
+            headers=["Endpoint", "Requests", "Errors", "Throttled", "Hedges won", "p50 (ms)", "p99 (ms)"],
+            tablefmt="simple"
+        )
+
+        lanes = tabulate(
+            [
+                (
+                    lane,
+                    metrics["granted"],
+                    metrics["waiting"],
+                    metrics["p50_wait_ms"] if metrics["p50_wait_ms"] is not None else "-",
+                    metrics["p95_wait_ms"] if metrics["p95_wait_ms"] is not None else "-",
+                )
+                for lane, metrics in self.gateway.lanes.get_stats().items()
+            ],
+            headers=["Lane", "Granted", "Waiting", "Wait p50 (ms)", "Wait p95 (ms)"],
+            tablefmt="simple"
+        )
+
+        flights = self.gateway.flights.get_stats()
+        missing = self.gateway.missing.get_stats()
+        circuits = ", ".join(
+            f"`{breaker.host}` {breaker.state}" + (f" (probe in {breaker.get_stats()['retry_in']}s)" if breaker.is_open else "")
+            for breaker in self.gateway.breakers.values()
+        ) or "none used yet"
+        message = (
+            f"`{len(stats)}` proxies, `{ejected}` ejected. Coalesced user lookups: `{flights['hits']}` shared, "
+            f"`{flights['misses']}` sent (`{flights['hit_rate']:.0%}` saved). Unknown users and missing matches: "
+            f"`{missing['size']}` remembered, `{missing['hits']}` requests skipped. Circuits: {circuits}.\n```{endpoints}```\n```{lanes}```\n```{table}```"
+        )
+        if len(stats) > self.MAX_LISTED_PROXIES:
+            message += f"...and `{len(stats) - self.MAX_LISTED_PROXIES}` more."
+
+        await interaction.response.send_message(message, ephemeral=True)
+        logger.info(f"User '{interaction.user.name}' checked the proxy pool health")
+
+    @proxies_command.error
+    async def proxies_command_error(
+        self, interaction: discord.Interaction, error: app_commands.AppCommandError
+    ):
+        """
+        Handles errors that occur during the execution of the proxies_command.
+
+        Args:
+            interaction (discord.Interaction): The interaction object.
+            error (app_commands.AppCommandError): The error that occurred.
+        """
+        if isinstance(error, app_commands.errors.MissingPermissions):
+            await interaction.response.send_message(
+                "You don't have the necessary permissions to use this command.",
+                ephemeral=True
+            )
+        else:
+            logger.error(f"An error occurred in the `/proxies` command: {error}")
+            await interaction.response.send_message(f"An error occurred: {error}", ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    """
+    Sets up the Proxies cog for the bot.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+    """
+    await bot.add_cog(Proxies(bot))
+    logger.info("Proxies cog loaded")
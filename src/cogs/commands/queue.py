@@ -70,6 +70,11 @@ class BattleQueue(commands.Cog):
                     )
 
             queue_message = "\n".join(queue_display)
+            if self.battleball_worker.paused:
+                queue_message = (
+                    f"{self.config.abajo_icon} The Habbo API is unavailable, updates are paused until it recovers.\n"
+                    f"{queue_message}"
+                )
             await interaction.response.send_message(
                 f"**Current Queue:**\n{queue_message}",
                 ephemeral=True
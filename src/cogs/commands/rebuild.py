@@ -0,0 +1,104 @@
+"""
+This module contains the BattleRebuild cog for the Discord bot.
+
+The BattleRebuild cog provides functionality to recompute every BattleBall profile's
+score and ranked match count from the stored matches.
+"""
+
+import time
+import discord
+from loguru import logger
+from discord.ext import commands
+from discord import app_commands
+
+from src.database.service.battleball_service import BattleballDatabaseService
+
+
+class BattleRebuild(commands.Cog):
+    """
+    A Discord bot cog for rebuilding or verifying BattleBall leaderboard aggregates.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+        db_service (BattleballDatabaseService): The database service for BattleBall.
+    """
+
+    MAX_LISTED_USERS = 10  # Drifted users listed in the reply
+
+    def __init__(self, bot: commands.Bot):
+        """
+        Initializes the BattleRebuild cog with a bot instance.
+
+        Args:
+            bot (commands.Bot): The bot instance.
+        """
+        self.bot = bot
+        self.db_service = BattleballDatabaseService()
+
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.command(
+        name="rebuild",
+        description="Command to recompute every BattleBall score from the stored matches."
+    )
+    async def battle_rebuild_command(self, interaction: discord.Interaction, verify_only: bool = True):
+        """
+        Command to recompute every BattleBall score from the stored matches.
+
+        Args:
+            interaction (discord.Interaction): The interaction object.
+            verify_only (bool, optional): Only report the drift without writing. Defaults to True.
+        """
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        start_time = time.time()
+        drift = await self.db_service.rebuild_user_stats(verify_only=verify_only)
+        elapsed = time.time() - start_time
+
+        action = "Verified" if verify_only else "Rebuilt"
+        lines = [f"{action} every user's stats in `{elapsed:.2f}` seconds, `{len(drift)}` users had drifted."]
+        for user in drift[:self.MAX_LISTED_USERS]:
+            lines.append(
+                f"- `{user['username']}`: score `{user['stored_score']}` -> `{user['expected_score']}`, "
+                f"ranked matches `{user['stored_ranked_matches']}` -> `{user['expected_ranked_matches']}`"
+            )
+        if len(drift) > self.MAX_LISTED_USERS:
+            lines.append(f"...and `{len(drift) - self.MAX_LISTED_USERS}` more.")
+
+        await interaction.followup.send("\n".join(lines), ephemeral=True)
+        logger.info(
+            f"User '{interaction.user.name}' triggered a stats {'verification' if verify_only else 'rebuild'}, "
+            f"{len(drift)} users had drifted")
+
+    @battle_rebuild_command.error
+    async def battle_rebuild_command_error(
+        self, interaction: discord.Interaction, error: app_commands.AppCommandError
+    ):
+        """
+        Handles errors that occur during the execution of the battle_rebuild_command.
+
+        Args:
+            interaction (discord.Interaction): The interaction object.
+            error (app_commands.AppCommandError): The error that occurred.
+        """
+        if isinstance(error, app_commands.errors.MissingPermissions):
+            await interaction.response.send_message(
+                "You don't have the necessary permissions to use this command.",
+                ephemeral=True
+            )
+        else:
+            logger.error(f"An error occurred in the `/rebuild` command: {error}")
+            if interaction.response.is_done():
+                await interaction.followup.send(f"An error occurred: {error}", ephemeral=True)
+            else:
+                await interaction.response.send_message(f"An error occurred: {error}", ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    """
+    Sets up the BattleRebuild cog for the bot.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+    """
+    await bot.add_cog(BattleRebuild(bot))
+    logger.info("BattleRebuild cog loaded")
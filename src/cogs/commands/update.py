@@ -9,6 +9,7 @@ from discord.ext import commands
 from discord import app_commands
 from loguru import logger
 
+from src.controller.habbo.http.gateway import HabboGateway
 from src.database.service.battleball_service import BattleballDatabaseService
 from src.controller.habbo.battleball.worker.worker import BattleballWorker
 
@@ -21,6 +22,7 @@ class BattleUpdate(commands.Cog):
         bot (commands.Bot): The bot instance.
         db_service (BattleballDatabaseService): The database service for BattleBall.
         battleball_worker (BattleballWorker): The worker for managing BattleBall updates.
+        gateway (HabboGateway): The Habbo HTTP gateway, whose negative cache knows unknown users.
     """
 
     def __init__(self, bot: commands.Bot):
@@ -33,6 +35,7 @@ class BattleUpdate(commands.Cog):
         self.bot = bot
         self.db_service = BattleballDatabaseService()
         self.battleball_worker = BattleballWorker(bot)
+        self.gateway = HabboGateway()
 
     @app_commands.command(
         name="update",
@@ -50,6 +53,13 @@ class BattleUpdate(commands.Cog):
             interaction (discord.Interaction): The interaction object.
             username (str): The username of the BattleBall profile to update.
         """
+        if self.gateway.is_missing("users", username.lower()):
+            await interaction.response.send_message(
+                f"The user `{username}` doesn't exist in Habbo Origins.",
+                ephemeral=True
+            )
+            return
+
         added_by = interaction.user.id
         added_by_name = interaction.user.name
         position = await self.db_service.add_to_queue(username, added_by)
@@ -3,6 +3,7 @@ from loguru import logger
 import time
 
 from src.database.service.battleball_service import BattleballDatabaseService
+from src.controller.habbo.http.lanes import PERIODIC
 from src.controller.habbo.battleball.worker.worker import BattleballWorker
 from src.utils.time_utils import UpdateTimer
 from src.helper.config import Config
@@ -50,17 +51,15 @@ class BattleballUpdateLoop(commands.Cog):
             None
         """
         self.update_timer.update_last_run_time()  # Update the last_run_time here
-        leaderboard = await self.database_service.get_leaderboard()
+        top_users = await self.database_service.get_leaderboard(limit=45)
 
         # Only process if there are users to queue
-        if leaderboard:
-            # Get the top 45 users
-            top_users = leaderboard[:45]
-            for user in top_users:
-                username = user[0]
-                discord_id = 1270453978861142097
-
-                await self.database_service.add_to_queue(username, discord_id)
+        if top_users:
+            usernames = [user[0] for user in top_users]
+            discord_id = 1270453978861142097
+
+            # Refresh jobs yield Habbo capacity to /keko lookups and /update jobs
+            await self.database_service.bulk_add_to_queue(usernames, discord_id, lane=PERIODIC)
 
             # Start the worker if it's not running
             if not self.battleball_worker.running:
@@ -1,89 +1,134 @@
 import httpx
-import random
-import asyncio
-from typing import List
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional, Tuple, Union
 from loguru import logger
+from pydantic import ValidationError
+from src.helper.config import Config
 from src.helper.singleton import Singleton
+from src.utils.async_utils import sliding_window
+from src.controller.habbo.http.gateway import HabboGateway
+from src.database.service.match_payload_store import MatchPayloadStore
 from src.controller.habbo.battleball.api_client.models import User, Match
 
 @Singleton
 class HabboApiClient:
-    BASE_URL = "https://origins.habbo.es/api/public"
-    TIMEOUT = 10.0
-    MAX_ATTEMPTS = 5
-    MAX_WORKERS = 5  # Maximum concurrent requests
-
     def __init__(self):
-        self.proxies = self.load_proxies()
+        self.config = Config()
+        self.gateway = HabboGateway()
+        self.payloads = MatchPayloadStore()
+
+    async def fetch_user_data(self, username: str) -> Optional[User]:
+        data = await self.gateway.get_user(username)
+        if data is None:
+            return None
+
+        try:
+            return User(**data)
+        except ValidationError as e:
+            self.gateway.mark_missing("users", username.lower())
+            logger.warning(f"Invalid user data for username '{username}': {e}")
+            return None
 
-    def load_proxies(self) -> List[str]:
-        with open("src/assets/proxies.txt", "r") as f:
-            return [line.strip() for line in f if line.strip()]
+    async def iter_match_id_pages(
+        self, bouncerPlayerId: str, offset: int = 0, limit: int = 100
+    ) -> AsyncIterator[List[str]]:
+        """
+        Yields a player's match IDs page by page, newest first, as they arrive, so the
+        caller can work on a page while the next one loads and only holds one at a time.
+        Each page is retried on its own at its offset, a failure never refetches the
+        pages before it.
 
-    def get_random_proxy(self) -> str:
-        return random.choice(self.proxies)
+        Paging ends at an empty page, or wherever the caller stops.
 
-    async def fetch_user_data(self, username: str) -> User:
-        username = username.lower()
-        for attempt in range(self.MAX_ATTEMPTS):
+        Raises:
+            httpx.HTTPStatusError: For a 404, the API doesn't know the bouncerPlayerId,
+                which means it's stale and has to be resolved again. Also when a page
+                fails every attempt, like `httpx.RequestError`.
+        """
+        while True:
             try:
-                proxy = self.get_random_proxy()
-                async with httpx.AsyncClient(proxies=proxy, timeout=self.TIMEOUT) as client:
-                    response = await client.get(f"{self.BASE_URL}/users?name={username}")
-                    response.raise_for_status()
-                    data = response.json()
-                    return User(**data)
-            except (httpx.RequestError, httpx.HTTPStatusError) as e:
-                logger.warning(f"Attempt {attempt + 1}/{self.MAX_ATTEMPTS} failed for user '{username}': {e}")
-                if attempt < self.MAX_ATTEMPTS - 1:
-                    await asyncio.sleep(1)  # Add a small delay before retrying
-        logger.error(f"Failed to fetch user data for username '{username}' after {self.MAX_ATTEMPTS} attempts")
-        return None
+                page = await self.gateway.get_match_ids_page(bouncerPlayerId, offset, limit)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    logger.warning(f"No match history found for bouncerPlayerId '{bouncerPlayerId}'")
+                else:
+                    logger.error(f"Failed to fetch match IDs for bouncerPlayerId '{bouncerPlayerId}' at offset {offset}: {e}")
+                raise
+            except httpx.RequestError as e:
+                logger.error(f"Failed to fetch match IDs for bouncerPlayerId '{bouncerPlayerId}' at offset {offset}: {e}")
+                raise
 
-    async def fetch_match_ids(self, bouncerPlayerId: str, offset: int = 0, limit: int = 100) -> List[str]:
-        match_ids = []
-        for attempt in range(self.MAX_ATTEMPTS):
+            if not page:
+                return
+            yield page
+            offset += limit
+
+    async def fetch_match_data(self, match_id: str) -> Optional[Match]:
+        """
+        Returns a match from the local payload store, or fetches and stores it.
+        Matches that are missing or don't validate are remembered and skipped.
+        """
+        match, _ = await self._fetch_match(match_id)
+        return match
+
+    async def _fetch_match(self, match_id: str) -> Tuple[Optional[Match], bool]:
+        """
+        Does the work of `fetch_match_data`, returning the match along with whether a
+        failed fetch is permanent: the match is missing or doesn't validate, so trying
+        again later won't help.
+        """
+        data = await self.payloads.get(match_id)
+        if data is not None:
             try:
-                proxy = self.get_random_proxy()
-                async with httpx.AsyncClient(proxies=proxy, timeout=self.TIMEOUT) as client:
-                    while True:
-                        response = await client.get(
-                            f"{self.BASE_URL}/matches/v1/{bouncerPlayerId}/ids",
-                            params={"offset": offset, "limit": limit}
-                        )
-                        response.raise_for_status()
-                        data = response.json()
+                return Match(**data), False
+            except ValidationError as e:
+                # Stored by an older model or damaged, the API has the current one
+                logger.warning(f"Dropping stored payload of match '{match_id}' that no longer validates: {e}")
+                await self.payloads.delete(match_id)
 
-                        if not data:
-                            break
+        if self.gateway.is_missing("matches", match_id):
+            return None, True
 
-                        match_ids.extend(data)
-                        offset += limit
-                return match_ids
-            except (httpx.RequestError, httpx.HTTPStatusError) as e:
-                logger.warning(f"Attempt {attempt + 1}/{self.MAX_ATTEMPTS} failed for bouncerPlayerId '{bouncerPlayerId}': {e}")
-                if attempt < self.MAX_ATTEMPTS - 1:
-                    await asyncio.sleep(1)  # Add a small delay before retrying
-        logger.error(f"Failed to fetch match IDs for bouncerPlayerId '{bouncerPlayerId}' after {self.MAX_ATTEMPTS} attempts")
-        return []
+        try:
+            data = await self.gateway.get_match(match_id)
+            match = Match(**data)
+            await self.payloads.put(match_id, data)
+            return match, False
+        except (httpx.RequestError, httpx.HTTPStatusError, ValidationError) as e:
+            permanent = self.gateway.is_permanent(e)
+            if permanent:
+                self.gateway.mark_missing("matches", match_id)
+            logger.error(f"Failed to fetch match data for ID '{match_id}': {e}")
+            return None, permanent
 
-    async def fetch_match_data_batch(self, match_ids: List[str]) -> List[Match]:
-        async def fetch_match_data(match_id: str) -> Match:
-            for attempt in range(self.MAX_ATTEMPTS):
-                try:
-                    proxy = self.get_random_proxy()
-                    async with httpx.AsyncClient(proxies=proxy, timeout=self.TIMEOUT) as client:
-                        response = await client.get(f"{self.BASE_URL}/matches/v1/{match_id}")
-                        response.raise_for_status()
-                        data = response.json()
-                        return Match(**data)
-                except (httpx.RequestError, httpx.HTTPStatusError) as e:
-                    logger.warning(f"Attempt {attempt + 1}/{self.MAX_ATTEMPTS} failed for match ID '{match_id}': {e}")
-                    if attempt < self.MAX_ATTEMPTS - 1:
-                        await asyncio.sleep(1)  # Add a small delay before retrying
-            logger.error(f"Failed to fetch match data for ID '{match_id}' after {self.MAX_ATTEMPTS} attempts")
-            return None
+    @property
+    def concurrency(self) -> int:
+        """
+        Match fetches kept in flight by `iter_match_data`, scaled with the number of proxies.
+        """
+        return self.config.habbo_api_concurrency_per_proxy * len(self.gateway.proxies)
+
+    async def iter_match_data(
+        self, match_ids: Union[Iterable[str], AsyncIterable[str]], concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Optional[Match], bool]]:
+        """
+        Fetches matches with a sliding window of `concurrency` requests in flight and
+        yields each (match_id, match, permanent) as soon as it arrives, so a slow request
+        never holds up the others. A match that failed every attempt comes with None,
+        and `permanent` tells whether it never will succeed. Results come in
+        completion order, not in the order of `match_ids`. Stops early once the API's
+        circuit opens, since every remaining fetch would fail.
+
+        `match_ids` can be an async iterable still paging through the API, fetches
+        then start while later pages load.
+        """
+        async def fetch(match_id: str) -> Tuple[str, Optional[Match], bool]:
+            return (match_id, *await self._fetch_match(match_id))
 
-        tasks = [fetch_match_data(match_id) for match_id in match_ids]
-        results = await asyncio.gather(*tasks)
-        return [result for result in results if result is not None]
\ No newline at end of file
+        window = sliding_window(fetch, match_ids, concurrency or self.concurrency)
+        try:
+            async for match_id, match, permanent in window:
+                yield match_id, match, permanent
+                if match is None and self.gateway.api_breaker.is_open:
+                    return
+        finally:
+            await window.aclose()
@@ -1,25 +1,36 @@
 import time
+import httpx
 import discord
-import asyncio
+from typing import AsyncIterator, Optional
 from loguru import logger
 from tabulate import tabulate
 from discord.ext import commands
 from src.helper.config import Config
 from src.helper.dmer import DiscordDmer
 from src.helper.singleton import Singleton
+from src.utils.cache_utils import TTLCache
+from src.controller.habbo.http.lanes import current_lane, MANUAL
 from src.controller.habbo.battleball.api_client.client import HabboApiClient
 from src.database.service.battleball_service import BattleballDatabaseService, Match
 
 
 @Singleton
 class BattleballWorker:
+    RECORD_BATCH_SIZE = 50  # Fetched matches stored per record_matches call
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.config = Config()
         self.db_service = BattleballDatabaseService()
         self.api_client = HabboApiClient()
+        # username -> bouncerPlayerId, in front of the identity stored on the users row
+        self.identities = TTLCache(
+            self.config.habbo_identity_cache_size,
+            self.config.habbo_identity_cache_ttl_seconds
+        )
         self.dmer = DiscordDmer(bot)
         self.running = False
+        self.paused = False  # Waiting out a Habbo API outage, see `wait_for_recovery`
         self.current_user = None
         self.remaining_matches = 0  # Track the number of remaining matches
 
@@ -30,55 +41,163 @@ class BattleballWorker:
             if not queue_item:
                 break
 
-            await self.process_user(queue_item)
-            await self.db_service.remove_from_queue(queue_item["id"])
-            await asyncio.sleep(1)  # Throttle to avoid API rate limits
+            await self.wait_for_recovery()
+            # Every request of the job, fetch tasks included, is scheduled in the job's lane
+            lane_token = current_lane.set(queue_item.get("lane") or MANUAL)
+            try:
+                done = await self.process_user(queue_item)
+            finally:
+                current_lane.reset(lane_token)
+            if not done:
+                # Cut short by an outage or a failed lookup, the job stays first in the queue to run again
+                continue
+            await self.writes.remove_from_queue(queue_item["id"])
+            # The next queue read has to see this removal
+            await self.db_service.flush_writes()
 
         self.running = False
 
     async def stop(self):
         self.running = False
 
-    async def process_user(self, queue_item):
+    async def wait_for_recovery(self):
+        """
+        Pauses while the Habbo API's circuit is open, until its next probe is due.
+        The next job's first request is that probe.
+        """
+        breaker = self.api_client.gateway.api_breaker
+        if not breaker.is_open:
+            return
+
+        self.paused = True
+        logger.warning(f"Habbo API unavailable, pausing the worker for up to {breaker.get_stats()['retry_in']}s")
+        await breaker.wait_for_probe()
+        self.paused = False
+
+    @property
+    def outage(self) -> bool:
+        return self.api_client.gateway.api_breaker.is_open
+
+    @property
+    def writes(self):
+        """
+        Where worker writes go: the write-behind stage when it's enabled,
+        otherwise the database service itself.
+        """
+        return self.db_service.write_behind or self.db_service
+
+    async def process_user(self, queue_item) -> bool:
+        """
+        Ingests the new matches of a queued user. Returns False if a Habbo API outage,
+        or a user lookup or match page that failed on an error that can pass, cut the
+        job short, in which case nothing is reported to the user and the job has to
+        run again.
+        """
         start_time = time.time()
 
         username = queue_item["username"].lower()
         discord_id = queue_item["discord_id"]
 
+        if self.api_client.gateway.is_missing("users", username):
+            logger.warning(f"Skipping unknown user '{username}'")
+            await self.dmer.send_dm(
+                discord_id, f"{self.config.abajo_icon} Failed to process user '{username}'.")
+            return True
+
         await self.db_service.add_user(username)
         user_id = await self.db_service.get_user_id(username)
 
         if not user_id:
             logger.error(f"User ID not found for username '{username}'")
-            return
+            return True
 
         self.current_user = username
-        user_data = await self.api_client.fetch_user_data(username)
+        bouncer_player_id = await self.resolve_bouncer_player_id(username, user_id)
 
-        if not user_data:
-            self.dmer.send_dm(
+        if not bouncer_player_id:
+            if not self.api_client.gateway.is_missing("users", username):
+                return self.postpone(username, "User lookup failed")
+            await self.dmer.send_dm(
                 discord_id, f"{self.config.abajo_icon} Failed to process user '{username}'.")
-            return
+            return True
 
-        checked_match_ids = await self.db_service.get_checked_matches(user_id)
-
-        bouncer_player_id = user_data.bouncerPlayerId
-        match_ids = await self.api_client.fetch_match_ids(bouncer_player_id)
+        try:
+            processed = await self.ingest_matches(username, user_id, bouncer_player_id)
+
+            if processed is None:
+                # A 404 makes the stored bouncerPlayerId suspect, look it up live once
+                stale_bouncer_player_id = bouncer_player_id
+                bouncer_player_id = await self.resolve_bouncer_player_id(username, user_id, refresh=True)
+                if not bouncer_player_id and not self.api_client.gateway.is_missing("users", username):
+                    return self.postpone(username, "User lookup failed")
+                if bouncer_player_id and bouncer_player_id != stale_bouncer_player_id:
+                    processed = await self.ingest_matches(username, user_id, bouncer_player_id)
+        except (httpx.RequestError, httpx.HTTPStatusError):
+            return self.postpone(username, "Fetching match IDs failed")
+
+        if self.outage:
+            return self.postpone(username, "Habbo API outage")
+
+        if processed is None:
+            await self.dmer.send_dm(
+                discord_id, f"{self.config.abajo_icon} Failed to process user '{username}'.")
+            return True
 
-        new_match_ids = [
-            match_id for match_id in match_ids if match_id not in checked_match_ids]
-        # Set the initial count of remaining matches
-        self.remaining_matches = len(new_match_ids)
+        try:
+            await self.dmer.send_dm(
+                discord_id, f"{self.config.arriba_icon} Job for user `{username}` has been completed.")
+        except discord.HTTPException as e:
+            logger.error(f"Failed to send DM to user '{username}': {e}")
 
         logger.info(
-            f"Processing '{self.remaining_matches}' new matches for '{username}'")
+            f"Processed '{processed}' matches for '{username}' in '{time.time() - start_time:.2f}' seconds")
+        self.current_user = None
+        self.remaining_matches = 0  # Reset after processing
+        return True
+
+    def postpone(self, username: str, reason: str) -> bool:
+        """
+        Leaves the job in the queue to run again. What was fetched is stored, so the
+        rerun only fetches the rest.
+        """
+        logger.warning(f"{reason} while processing '{username}', the job will run again")
+        self.current_user = None
+        self.remaining_matches = 0
+        return False
+
+    async def ingest_matches(self, username: str, user_id: int, bouncer_player_id: str) -> Optional[int]:
+        """
+        Streams the user's new matches into the database. Match IDs are paged, filtered
+        against the stored matches and fetched in one pipeline, so fetches start while
+        later pages load and memory stays flat on long histories.
+
+        Paging goes back to the user's history head, below which every match is stored.
+        Only an ingest that gets there and resolves every new match on the way, stored
+        or known to be missing from the API, moves the head up to the newest match, so
+        the next one pages back to the old head and picks up what a cut-short ingest,
+        or a failed fetch, left out.
 
-        for i in range(0, len(new_match_ids), 3):
-            batch = new_match_ids[i:i+3]
-            matches = await self.api_client.fetch_match_data_batch(batch)
+        Returns the number of matches stored, or None if the API doesn't know the bouncerPlayerId.
+
+        Raises:
+            httpx.RequestError, httpx.HTTPStatusError: When paging fails on an error that
+                can pass, like a timeout or a 5xx, after storing what was fetched.
+        """
+        history_head = None if self.config.battleball_full_crawl else await self.db_service.get_history_head(user_id)
+        crawl = {"newest": None, "complete": False}
+        self.remaining_matches = 0
+        processed = 0
+        processed_matches = []
+        try:
+            async for match_id, match_data, permanent in self.api_client.iter_match_data(
+                self.iter_new_match_ids(user_id, bouncer_player_id, history_head, crawl)
+            ):
+                if match_data is None:
+                    if permanent:
+                        # It will never be stored, so it mustn't hold the history head back
+                        self.remaining_matches -= 1
+                    continue
 
-            for match_data in matches:
-                match_id = match_data.metadata.matchId
                 participant = next(
                     (p for p in match_data.info.participants if p.gamePlayerId == bouncer_player_id), None)
 
@@ -92,29 +211,88 @@ class BattleballWorker:
                     score = 0
                     is_ranked = False
 
-                match = Match(
+                processed_matches.append(Match(
                     match_id=match_id,
                     user_id=user_id,
                     game_score=score,
                     ranked=is_ranked
-                )
-
-                await self.db_service.add_match(match)
-                await self.db_service.update_user_score_and_matches(user_id, score, is_ranked)
+                ))
+                processed += 1
 
                 # Decrement the remaining matches count
                 self.remaining_matches -= 1
 
+                # Store as results stream in, so memory stays flat on long histories
+                if len(processed_matches) >= self.RECORD_BATCH_SIZE:
+                    await self.writes.record_matches(user_id, processed_matches)
+                    processed_matches = []
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            if not self.api_client.gateway.is_permanent(e):
+                raise
+            return processed
+        finally:
+            if processed_matches:
+                await self.writes.record_matches(user_id, processed_matches)
+
+        if crawl["complete"] and crawl["newest"] and self.remaining_matches == 0:
+            # Queued after the last match batch, so it never lands before the matches it covers
+            await self.writes.set_history_head(user_id, crawl["newest"])
+        return processed
+
+    async def iter_new_match_ids(
+        self, user_id: int, bouncer_player_id: str, history_head: Optional[str], crawl: dict
+    ) -> AsyncIterator[str]:
+        """
+        Yields the IDs of the user's matches that aren't stored yet, newest first, one
+        page at a time. Paging stops after the page holding `history_head`, since every
+        older match is stored, and goes through the whole history without one.
+
+        Sets `crawl["newest"]` to the newest match ID, and `crawl["complete"]` once
+        paging got to the head or to the end.
+        """
+        pages = self.api_client.iter_match_id_pages(bouncer_player_id)
         try:
-            self.dmer.send_dm(
-                discord_id, f"{self.config.arriba_icon} Job for user `{username}` has been completed.")
-        except discord.HTTPException as e:
-            logger.error(f"Failed to send DM to user '{username}': {e}")
+            async for page in pages:
+                if crawl["newest"] is None:
+                    crawl["newest"] = page[0]
+                new_match_ids = await self.db_service.get_unprocessed_match_ids(user_id, page)
+                # Grows as pages arrive, the total isn't known up front anymore
+                self.remaining_matches += len(new_match_ids)
+                for match_id in new_match_ids:
+                    yield match_id
+                if history_head is not None and history_head in page:
+                    break
+            crawl["complete"] = True
+        finally:
+            await pages.aclose()
+
+    async def resolve_bouncer_player_id(self, username: str, user_id: int, refresh: bool = False) -> Optional[str]:
+        """
+        Returns the user's bouncerPlayerId, which never changes for an account. It comes
+        from the in-memory cache, then from the users row, and the API is only called
+        when both miss or when `refresh` marks the known one as suspect.
+        """
+        if refresh:
+            self.identities.invalidate(username)
+        else:
+            bouncer_player_id = self.identities.get(username)
+            if bouncer_player_id:
+                return bouncer_player_id
 
-        logger.info(
-            f"Processed '{len(new_match_ids)}' matches for '{username}' in '{time.time() - start_time:.2f}' seconds")
-        self.current_user = None
-        self.remaining_matches = 0  # Reset after processing
+            identity = await self.db_service.get_user_identity(user_id)
+            if identity:
+                self.identities.set(username, identity[1])
+                return identity[1]
+
+        user_data = await self.api_client.fetch_user_data(username)
+        if not user_data:
+            return None
+
+        await self.db_service.set_user_identity(user_id, user_data.uniqueId, user_data.bouncerPlayerId)
+        self.identities.set(username, user_data.bouncerPlayerId)
+        return user_data.bouncerPlayerId
 
     async def get_remaining_matches(self) -> int:
         """
@@ -187,14 +365,3 @@ class BattleballWorker:
 
         logger.debug(f"Formatted text length: {len(formatted_text)}")
         return formatted_text
-
-    async def update_user_stats(self, user_id, username, matches):
-        total_score = 0
-        ranked_matches = 0
-
-        for match in matches:
-            if match.info.ranked:
-                total_score += match.info.gameScore
-                ranked_matches += 1
-
-        await self.db_service.update_user_stats(user_id, username, total_score, ranked_matches)
\ No newline at end of file
@@ -1,8 +1,8 @@
 import os
-import httpx
 from io import BytesIO
 from loguru import logger
 from src.helper.singleton import Singleton
+from src.controller.habbo.http.gateway import HabboGateway
 from PIL import Image, ImageDraw, ImageFont
 
 
@@ -15,7 +15,7 @@ class HabboController:
         if hasattr(self, '_initialized') and self._initialized:
             return
 
-        self.client = httpx.AsyncClient(timeout=None)
+        self.gateway = HabboGateway()
         self._initialized = True
 
         base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -35,14 +35,8 @@ class HabboController:
         Returns:
             dict: User information as a dictionary, or None if the request fails.
         """
-        url = f"https://origins.habbo.es/api/public/users?name={username}"
-        try:
-            response = await self.client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to get user info: {e}")
-            return None
+        # Concurrent lookups of the same name, from /keko or the worker, share one request
+        return await self.gateway.get_user(username)
 
     async def get_avatar_image(self, figure_string):
         """Get the avatar image of a user.
@@ -53,11 +47,9 @@ class HabboController:
         Returns:
             PIL.Image.Image: The avatar image as a PIL Image object, or None if the request fails.
         """
-        url = f"https://www.habbo.es/habbo-imaging/avatarimage?&figure={figure_string}"
         try:
-            response = await self.client.get(url)
-            response.raise_for_status()
-            return Image.open(BytesIO(response.content))
+            content = await self.gateway.get_avatar_image(figure_string)
+            return Image.open(BytesIO(content))
         except Exception as e:
             logger.error(f"Failed to get avatar image: {e}")
             return None
@@ -225,12 +217,3 @@ class HabboController:
                 os.remove(file_path)
         except Exception as e:
             logger.critical(f"Failed to delete image: {e}")
-
-    async def __aenter__(self):
-        """Enter the asynchronous context manager."""
-        self.client = httpx.AsyncClient(timeout=None)
-        return self
-
-    async def __aexit__(self, _exc_type, _exc_value, _traceback):
-        """Exit the asynchronous context manager."""
-        await self.client.aclose()
@@ -0,0 +1,100 @@
+import time
+import asyncio
+import httpx
+from loguru import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(httpx.TransportError):
+    """
+    Raised instead of sending a request to a host whose circuit is open. It is an
+    `httpx.RequestError`, so callers handle it like any other failed request.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stops requests to a host that keeps failing.
+
+    After `failure_threshold` consecutive failures (transport errors or 5xx, with no
+    response from the host in between) the circuit opens and requests fail fast
+    without being sent. Once the cooldown is over, a single request goes through as a
+    probe: if the host answers, the circuit closes, otherwise it opens again with the
+    cooldown doubled, up to `max_cooldown`.
+    """
+
+    def __init__(self, host: str, failure_threshold: int = 10, cooldown: float = 15, max_cooldown: float = 300):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0  # Consecutive openings, each doubles the cooldown
+        self.rejected = 0
+        self.retry_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != CLOSED
+
+    def allow(self) -> bool:
+        """
+        Whether a request may go out now. While open, the first request after the
+        cooldown is let through as the probe.
+        """
+        if self.state == CLOSED:
+            return True
+
+        now = time.monotonic()
+        if now >= self.retry_at:
+            # Re-arming the cooldown allows another probe if this one never reports back
+            self.state = HALF_OPEN
+            self.retry_at = now + self._current_cooldown()
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        """
+        Records a response from the host, any status that doesn't point at an outage.
+        """
+        if self.state != CLOSED:
+            logger.info(f"Habbo host '{self.host}' is answering again, circuit closed.")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+            self.trips += 1
+            cooldown = self._current_cooldown()
+            self.state = OPEN
+            self.retry_at = time.monotonic() + cooldown
+            logger.warning(
+                f"Habbo host '{self.host}' failed {self.consecutive_failures} requests in a row, "
+                f"circuit open for {cooldown:.0f}s.")
+
+    def _current_cooldown(self) -> float:
+        return min(self.cooldown * 2 ** max(self.trips - 1, 0), self.max_cooldown)
+
+    async def wait_for_probe(self):
+        """
+        Waits until the circuit is closed or lets a probe through.
+        """
+        while self.state != CLOSED and time.monotonic() < self.retry_at:
+            await asyncio.sleep(self.retry_at - time.monotonic())
+
+    def get_stats(self) -> dict:
+        return {
+            "host": self.host,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+            "retry_in": round(max(self.retry_at - time.monotonic(), 0.0), 1) if self.is_open else None,
+        }
@@ -0,0 +1,58 @@
+import httpx
+from loguru import logger
+from typing import Dict, Optional
+
+
+class HttpClientPool:
+    """
+    Long-lived httpx clients, one per proxy.
+
+    Each client keeps its connections alive between requests, so consecutive calls
+    through the same proxy reuse the TCP and TLS session instead of handshaking
+    again. With HTTP/2 enabled, concurrent requests share a single connection.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        http2: bool = True,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        verify=True
+    ):
+        self.timeout = timeout
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.verify = verify
+        self._clients: Dict[Optional[str], httpx.AsyncClient] = {}
+
+    def get(self, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        """
+        Returns the client for a proxy, creating it on first use.
+        A proxy of None means a direct connection.
+        """
+        client = self._clients.get(proxy)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                proxy=proxy,
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+                verify=self.verify
+            )
+            self._clients[proxy] = client
+        return client
+
+    async def aclose(self):
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+        logger.debug(f"Closed {len(clients)} pooled HTTP clients.")
+
+    def __len__(self) -> int:
+        return len(self._clients)
@@ -0,0 +1,369 @@
+import time
+import httpx
+import asyncio
+from loguru import logger
+from urllib.parse import urlsplit
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from src.helper.config import Config
+from src.helper.singleton import Singleton
+from src.utils.cache_utils import TTLCache
+from src.utils.stats_utils import percentile
+from src.controller.habbo.http.proxy_pool import ProxyPool
+from src.controller.habbo.http.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.controller.habbo.http.lanes import LaneScheduler, INTERACTIVE, MANUAL, PERIODIC
+from src.controller.habbo.http.single_flight import SingleFlight
+from src.controller.habbo.http.client_pool import HttpClientPool
+from src.controller.habbo.http.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class InvalidResponseError(httpx.TransportError):
+    """
+    Raised for a successful response whose body isn't the JSON the endpoint sends,
+    like the HTML page of a captive portal behind a proxy. It is an
+    `httpx.RequestError`, so it is retried through another proxy like any other failed request.
+    """
+
+
+class EndpointMetrics:
+    """
+    Request counters for one Habbo endpoint, plus the latencies of its most recent
+    `LATENCY_SAMPLES` requests for percentiles.
+    """
+
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.latency_seconds = 0.0
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLES)
+
+    def record_latency(self, seconds: float):
+        self.latency_seconds += seconds
+        self.latencies.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Returns the `q` percentile (0-100) of the recent latencies in seconds, or None without samples.
+        """
+        return percentile(self.latencies, q)
+
+    def as_dict(self) -> dict:
+        p50, p99 = self.percentile(50), self.percentile(99)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "mean_latency_ms": round(self.latency_seconds / self.requests * 1000, 1) if self.requests else None,
+            "p50_latency_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p99_latency_ms": round(p99 * 1000, 1) if p99 is not None else None,
+        }
+
+
+@Singleton
+class HabboGateway:
+    """
+    The single HTTP stack for every Habbo endpoint: users, match IDs, matches and avatar images.
+
+    Requests share one pool of keep-alive clients, one health-scored proxy pool, one
+    adaptive rate limiter and one set of timeouts and retries, so limits and telemetry
+    cover all Habbo traffic at once. `HabboApiClient` and `HabboController` build on it.
+    Rate limiter tokens are handed out by priority lane, see `LaneScheduler`, and a
+    host that keeps failing gets its circuit opened, see `CircuitBreaker`.
+    """
+
+    API_URL = "https://origins.habbo.es/api/public"
+    IMAGING_URL = "https://www.habbo.es/habbo-imaging"
+    TIMEOUT = 10.0
+    MAX_ATTEMPTS = 5
+    PROXIES_FILE = "src/assets/proxies.txt"
+    PROXY_FAILURE_STATUSES = (403, 407, 429)  # Statuses that point at the proxy rather than the request
+    HEDGE_MIN_SAMPLES = 20  # Latencies needed before the hedging percentile means anything
+
+    def __init__(self):
+        self.config = Config()
+        # Instance attributes so a stand-in server can take the place of the real hosts
+        self.api_url = self.API_URL
+        self.imaging_url = self.IMAGING_URL
+        self.proxies = ProxyPool.from_file(
+            self.PROXIES_FILE,
+            max_failures=self.config.habbo_proxy_max_failures,
+            cooldown=self.config.habbo_proxy_cooldown_seconds,
+            max_cooldown=self.config.habbo_proxy_max_cooldown_seconds
+        )
+        self.clients = HttpClientPool(
+            timeout=self.TIMEOUT,
+            http2=self.config.habbo_api_http2,
+            max_connections=self.config.habbo_api_max_connections,
+            max_keepalive_connections=self.config.habbo_api_max_keepalive_connections,
+            keepalive_expiry=self.config.habbo_api_keepalive_expiry
+        )
+        # Shared by every call, retries included, so Habbo sees one steady stream
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=self.config.habbo_api_rate,
+            min_rate=self.config.habbo_api_min_rate,
+            max_rate=self.config.habbo_api_max_rate,
+            burst=self.config.habbo_api_burst
+        )
+        self.lanes = LaneScheduler(self.rate_limiter, {
+            INTERACTIVE: self.config.habbo_api_interactive_reserved_percent / 100,
+            MANUAL: self.config.habbo_api_manual_reserved_percent / 100,
+            PERIODIC: self.config.habbo_api_periodic_reserved_percent / 100,
+        })
+        self.flights = SingleFlight()
+        # (endpoint, key) of unknown users and missing matches, answered without a request until they expire
+        self.missing = TTLCache(
+            self.config.habbo_negative_cache_size,
+            self.config.habbo_negative_cache_ttl_seconds
+        )
+        self.metrics: Dict[str, EndpointMetrics] = defaultdict(EndpointMetrics)
+        self.sent = 0
+        self.hedged = 0
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    async def close(self):
+        await self.clients.aclose()
+
+    @classmethod
+    def is_retryable(cls, status_code: int) -> bool:
+        """
+        Whether a failed status can succeed on another attempt: throttling, proxy
+        trouble or a server error. Other client errors, like a 404, never will.
+        """
+        return status_code in cls.PROXY_FAILURE_STATUSES or status_code >= 500
+
+    @classmethod
+    def is_permanent(cls, error: Exception) -> bool:
+        """
+        Whether a failed request can never succeed as sent: a client error other than
+        throttling or proxy trouble, like a 404, or a JSON body that doesn't validate
+        against its model. Timeouts, transport errors, bodies that aren't JSON, 429s
+        and 5xx are retryable.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            return not cls.is_retryable(error.response.status_code)
+        return isinstance(error, ValidationError)
+
+    def is_missing(self, endpoint: str, key: str) -> bool:
+        return self.missing.get((endpoint, key)) is not None
+
+    def mark_missing(self, endpoint: str, key: str):
+        """
+        Remembers a resource that failed permanently, so it isn't requested again
+        until the negative cache entry expires.
+        """
+        self.missing.set((endpoint, key), True)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """
+        Returns the circuit breaker of the host a URL points at.
+        """
+        host = urlsplit(url).netloc
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(
+                host,
+                failure_threshold=self.config.habbo_circuit_failure_threshold,
+                cooldown=self.config.habbo_circuit_cooldown_seconds,
+                max_cooldown=self.config.habbo_circuit_max_cooldown_seconds
+            )
+        return self.breakers[host]
+
+    @property
+    def api_breaker(self) -> CircuitBreaker:
+        return self.breaker(self.api_url)
+
+    async def get(
+        self, endpoint: str, url: str, params: dict = None, hedge: bool = False, decode_json: bool = False
+    ) -> Any:
+        """
+        Sends one GET through a proxy picked by the pool once the current task's lane
+        gets a rate limiter token, records how the proxy and the endpoint did and raises for error statuses.
+        Returns the response, or with `decode_json` its decoded body, see `_send`.
+
+        With `hedge` and `habbo_api_hedging` on, a request still unanswered after the
+        endpoint's rolling `habbo_api_hedge_percentile` latency gets a duplicate through
+        another proxy, within `habbo_api_hedge_budget_percent` of all requests. The
+        first successful response wins and the other request is cancelled.
+
+        Raises `CircuitOpenError` without sending anything while the host's circuit is open.
+        """
+        if not self.breaker(url).allow():
+            raise CircuitOpenError(f"Circuit for '{urlsplit(url).netloc}' is open")
+        await self.lanes.acquire()
+        proxy = self.proxies.choose()
+        delay = self._hedge_delay(endpoint) if hedge else None
+        if delay is None:
+            return await self._send(endpoint, proxy, url, params, decode_json)
+
+        primary = asyncio.ensure_future(self._send(endpoint, proxy, url, params, decode_json))
+        duplicate = None
+        pending = {primary}
+        try:
+            await asyncio.wait(pending, timeout=delay)
+            if not primary.done() and self._hedge_allowed():
+                await self.lanes.acquire()
+                if not primary.done():
+                    self.hedged += 1
+                    self.metrics[endpoint].hedges += 1
+                    duplicate = asyncio.ensure_future(
+                        self._send(endpoint, self.proxies.choose(exclude=proxy), url, params, decode_json))
+                    pending.add(duplicate)
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is duplicate:
+                            self.metrics[endpoint].hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _hedge_delay(self, endpoint: str) -> Optional[float]:
+        if not self.config.habbo_api_hedging:
+            return None
+        metrics = self.metrics[endpoint]
+        if len(metrics.latencies) < self.HEDGE_MIN_SAMPLES:
+            return None
+        return metrics.percentile(self.config.habbo_api_hedge_percentile)
+
+    def _hedge_allowed(self) -> bool:
+        return self.hedged < self.sent * self.config.habbo_api_hedge_budget_percent / 100
+
+    async def _send(
+        self, endpoint: str, proxy: Optional[str], url: str, params: dict = None, decode_json: bool = False
+    ) -> Any:
+        """
+        With `decode_json`, a successful response is decoded here, where the proxy is
+        known, and a body that isn't JSON counts against the proxy and raises
+        `InvalidResponseError`. The host may well be fine, so the circuit doesn't hear of it.
+        """
+        metrics = self.metrics[endpoint]
+        breaker = self.breaker(url)
+        metrics.requests += 1
+        self.sent += 1
+        start = time.perf_counter()
+        try:
+            response = await self.clients.get(proxy).get(url, params=params)
+        except httpx.RequestError:
+            metrics.errors += 1
+            metrics.record_latency(time.perf_counter() - start)
+            self.proxies.record_failure(proxy)
+            breaker.record_failure()
+            raise
+        # A hedged request cancelled by the winner never gets here, so it doesn't skew the percentiles
+        latency = time.perf_counter() - start
+        metrics.record_latency(latency)
+
+        data = invalid = None
+        if decode_json and response.is_success:
+            try:
+                data = response.json()
+            except ValueError as e:
+                invalid = e
+
+        if invalid or response.status_code in self.PROXY_FAILURE_STATUSES or response.status_code >= 500:
+            self.proxies.record_failure(proxy)
+        else:
+            self.proxies.record_success(proxy, latency)
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        elif response.status_code not in (403, 407) and not invalid:
+            # Anything else came from the host itself, which is up; 403/407 may come from the proxy
+            breaker.record_success()
+
+        if response.status_code == 429 or (response.status_code == 503 and "Retry-After" in response.headers):
+            metrics.throttled += 1
+            self.rate_limiter.on_throttled(parse_retry_after(response.headers.get("Retry-After")))
+        elif response.status_code < 500:
+            self.rate_limiter.on_success()
+
+        if response.is_error or invalid:
+            metrics.errors += 1
+        response.raise_for_status()
+        if invalid:
+            raise InvalidResponseError(f"Response from '{url}' isn't valid JSON: {invalid}") from invalid
+        return data if decode_json else response
+
+    async def get_with_retries(
+        self, endpoint: str, url: str, params: dict = None, hedge: bool = False, decode_json: bool = False
+    ) -> Any:
+        """
+        Sends a GET, retrying transport errors, retryable statuses and bodies that
+        aren't JSON up to `MAX_ATTEMPTS` times. Raises the last error once every
+        attempt failed, or right away for a status that can't succeed or an open circuit.
+        """
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                return await self.get(endpoint, url, params, hedge, decode_json)
+            except CircuitOpenError:
+                # Retrying can't help until the cooldown is over
+                raise
+            except httpx.HTTPStatusError as e:
+                if not self.is_retryable(e.response.status_code) or attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+                logger.warning(f"Attempt {attempt + 1}/{self.MAX_ATTEMPTS} failed for {endpoint} '{url}': {e}")
+            except httpx.RequestError as e:
+                if attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+                logger.warning(f"Attempt {attempt + 1}/{self.MAX_ATTEMPTS} failed for {endpoint} '{url}': {e}")
+
+    async def get_user(self, username: str) -> Optional[dict]:
+        """
+        Returns the public profile of a user, or None if it can't be fetched.
+        Concurrent lookups of the same name share one request, see `SingleFlight`,
+        and names known not to exist are answered from the negative cache.
+        """
+        username = username.lower()
+        if self.is_missing("users", username):
+            logger.debug(f"Skipping lookup of unknown user '{username}'")
+            return None
+        return await self.flights.do(("users", username), lambda: self._fetch_user(username))
+
+    async def _fetch_user(self, username: str) -> Optional[dict]:
+        try:
+            data = await self.get_with_retries("users", f"{self.api_url}/users", {"name": username}, decode_json=True)
+        except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            if self.is_permanent(e):
+                self.mark_missing("users", username)
+                logger.warning(f"User '{username}' not found: {e}")
+            else:
+                logger.error(f"Failed to fetch user data for username '{username}': {e}")
+            return None
+
+        if "error" in data:
+            # The API's own answer about the name, not a failed request
+            self.mark_missing("users", username)
+            logger.warning(f"User '{username}' not found: {data['error']}")
+            return None
+        return data
+
+    async def get_match_ids_page(self, bouncer_player_id: str, offset: int, limit: int) -> List[str]:
+        return await self.get_with_retries(
+            "match_ids", f"{self.api_url}/matches/v1/{bouncer_player_id}/ids", {"offset": offset, "limit": limit},
+            decode_json=True)
+
+    async def get_match(self, match_id: str) -> dict:
+        # Match fetches dominate a job and are safe to duplicate, so their slow tail gets hedged
+        return await self.get_with_retries(
+            "matches", f"{self.api_url}/matches/v1/{match_id}", hedge=True, decode_json=True)
+
+    async def get_avatar_image(self, figure_string: str) -> bytes:
+        response = await self.get_with_retries(
+            "avatarimage", f"{self.imaging_url}/avatarimage", {"figure": figure_string})
+        return response.content
+
+    def get_stats(self) -> Dict[str, dict]:
+        return {endpoint: metrics.as_dict() for endpoint, metrics in sorted(self.metrics.items())}
@@ -0,0 +1,115 @@
+import time
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, Optional
+from src.utils.stats_utils import percentile
+from src.controller.habbo.http.rate_limiter import AdaptiveRateLimiter
+
+INTERACTIVE = "interactive"  # Lookups a Discord user is waiting on, like /keko
+MANUAL = "manual"  # Worker jobs queued with /update
+PERIODIC = "periodic"  # Worker jobs queued by the top users refresh
+LANES = (INTERACTIVE, MANUAL, PERIODIC)  # Highest priority first
+
+# Lane of the Habbo requests made by the current task. Tasks inherit it from the task
+# that created them, so a worker job sets it once for all of its fetches.
+current_lane: ContextVar[str] = ContextVar("habbo_lane", default=INTERACTIVE)
+
+
+class LaneMetrics:
+    """
+    Queue wait of one lane, with the waits of its most recent `WAIT_SAMPLES` requests for percentiles.
+    """
+
+    WAIT_SAMPLES = 1000
+
+    def __init__(self):
+        self.granted = 0
+        self.wait_seconds = 0.0
+        self.waits = deque(maxlen=self.WAIT_SAMPLES)
+
+    def record_wait(self, seconds: float):
+        self.granted += 1
+        self.wait_seconds += seconds
+        self.waits.append(seconds)
+
+    def as_dict(self) -> dict:
+        p50, p95 = percentile(self.waits, 50), percentile(self.waits, 95)
+        return {
+            "granted": self.granted,
+            "mean_wait_ms": round(self.wait_seconds / self.granted * 1000, 1) if self.granted else None,
+            "p50_wait_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_wait_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class LaneScheduler:
+    """
+    Hands out rate limiter tokens to waiting Habbo requests by lane.
+
+    Every token goes to the oldest waiter of the highest-priority lane, so an
+    interactive lookup never queues behind background ingestion: it takes the next
+    token, between two requests of a running job. A lane that got less than its
+    reserved share of the last `WINDOW` tokens is served first though, so a busy
+    higher lane can't starve the lanes under it.
+    """
+
+    WINDOW = 100  # Tokens over which reserved shares are measured
+
+    def __init__(self, limiter: AdaptiveRateLimiter, reservations: Dict[str, float]):
+        self.limiter = limiter
+        self.reservations = reservations  # lane -> reserved share of the tokens, 0 to 1
+        self.metrics: Dict[str, LaneMetrics] = {lane: LaneMetrics() for lane in LANES}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in LANES}
+        self._granted: Deque[str] = deque(maxlen=self.WINDOW)
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    async def acquire(self, lane: Optional[str] = None):
+        """
+        Waits for a rate limiter token in `lane`, the current task's lane by default.
+        """
+        lane = lane or current_lane.get()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiters[lane].append(future)
+        if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not loop:
+            self._dispatcher = loop.create_task(self._dispatch())
+
+        started = time.monotonic()
+        await future
+        self.metrics[lane].record_wait(time.monotonic() - started)
+
+    async def _dispatch(self):
+        while True:
+            self._drop_cancelled()
+            if not any(self._waiters.values()):
+                return
+            await self.limiter.acquire()
+            self._drop_cancelled()
+            lane = self._next_lane()
+            if lane is None:
+                return
+            self._waiters[lane].popleft().set_result(None)
+            self._granted.append(lane)
+
+    def _drop_cancelled(self):
+        for waiters in self._waiters.values():
+            while waiters and waiters[0].done():
+                waiters.popleft()
+
+    def _next_lane(self) -> Optional[str]:
+        waiting = [lane for lane in LANES if self._waiters[lane]]
+        if not waiting:
+            return None
+
+        for lane in waiting:
+            share = self._granted.count(lane) / len(self._granted) if self._granted else 0.0
+            if share < self.reservations.get(lane, 0.0):
+                return lane
+        return waiting[0]
+
+    def get_stats(self) -> Dict[str, dict]:
+        return {
+            lane: {**self.metrics[lane].as_dict(), "waiting": len(self._waiters[lane])}
+            for lane in LANES
+        }
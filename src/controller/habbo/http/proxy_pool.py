@@ -0,0 +1,181 @@
+import os
+import time
+import random
+from loguru import logger
+from urllib.parse import urlsplit
+from typing import Dict, List, Optional
+
+
+class ProxyHealth:
+    """
+    Rolling health of a single proxy.
+
+    Attributes:
+        proxy (Optional[str]): The proxy URL, None for a direct connection.
+        latency (Optional[float]): EWMA of successful request latency, in seconds.
+        error_rate (float): EWMA of failures, from 0 (healthy) to 1 (always failing).
+        consecutive_failures (int): Failures since the last success.
+        ejections (int): Times the proxy was ejected in a row, drives the cooldown backoff.
+        ejected_until (float): Monotonic time the cooldown ends, 0 while the proxy is in rotation.
+        probing (bool): Whether a probe request is in flight after a cooldown.
+    """
+
+    def __init__(self, proxy: Optional[str]):
+        self.proxy = proxy
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.probing = False
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until > 0
+
+    @property
+    def label(self) -> str:
+        """
+        The proxy without its credentials, safe for logs and Discord messages.
+        """
+        if self.proxy is None:
+            return "direct"
+        url = urlsplit(self.proxy)
+        return f"{url.scheme}://{url.hostname}:{url.port}" if url.port else f"{url.scheme}://{url.hostname}"
+
+    def as_dict(self) -> dict:
+        return {
+            "proxy": self.label,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "ejected_for": round(max(self.ejected_until - time.monotonic(), 0), 1) if self.ejected else 0,
+        }
+
+
+class ProxyPool:
+    """
+    Picks a proxy per request, weighted by health.
+
+    Healthy proxies are chosen with a weight of (1 - error rate) / latency, so fast and
+    reliable proxies take most of the traffic while slower ones still get sampled.
+    After `max_failures` consecutive failures a proxy is ejected for a cooldown that
+    doubles on every ejection in a row, up to `max_cooldown`. Once the cooldown ends a
+    single probe request is let through: a success puts the proxy back in rotation,
+    a failure ejects it again.
+
+    An empty pool runs in no-proxy mode with a single direct connection (None).
+    """
+
+    ALPHA = 0.3  # EWMA smoothing, higher reacts faster
+    MIN_WEIGHT = 0.05  # Keeps a struggling proxy sampled so it can recover
+
+    def __init__(self, proxies: List[str], max_failures: int = 3, cooldown: float = 60, max_cooldown: float = 600):
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._health: Dict[Optional[str], ProxyHealth] = {
+            proxy: ProxyHealth(proxy) for proxy in (proxies or [None])
+        }
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ProxyPool":
+        """
+        Loads one proxy URL per line. A missing or empty file means no-proxy mode.
+        """
+        proxies = []
+        if os.path.isfile(path):
+            with open(path, "r") as f:
+                proxies = [line.strip() for line in f if line.strip()]
+
+        if not proxies:
+            logger.warning(f"No proxies found in '{path}', requests go out directly.")
+        return cls(proxies, **kwargs)
+
+    @property
+    def direct(self) -> bool:
+        return list(self._health) == [None]
+
+    def __len__(self) -> int:
+        return len(self._health)
+
+    def choose(self, exclude: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the proxy to use for the next request. `exclude` is skipped when
+        there is any other proxy, so a duplicate request takes a different route.
+        """
+        now = time.monotonic()
+        candidates = [h for h in self._health.values() if h.proxy != exclude] or list(self._health.values())
+        healthy = []
+        for health in candidates:
+            if not health.ejected:
+                healthy.append(health)
+            elif health.ejected_until <= now:
+                # The cooldown is over, send one request through to see if it recovered.
+                # Re-arming the cooldown allows another probe if this one never reports back.
+                health.probing = True
+                health.ejected_until = now + self.cooldown
+                return health.proxy
+
+        if not healthy:
+            # Everything is ejected: use the one closest to the end of its cooldown
+            return min(candidates, key=lambda h: h.ejected_until).proxy
+
+        known_latencies = [h.latency for h in healthy if h.latency is not None]
+        default_latency = sum(known_latencies) / len(known_latencies) if known_latencies else 1.0
+        weights = [
+            max((1 - health.error_rate) / (health.latency or default_latency), self.MIN_WEIGHT)
+            for health in healthy
+        ]
+        return random.choices(healthy, weights=weights)[0].proxy
+
+    def record_success(self, proxy: Optional[str], latency: float):
+        health = self._health.get(proxy)
+        if health is None:
+            return
+
+        health.requests += 1
+        health.consecutive_failures = 0
+        health.error_rate *= 1 - self.ALPHA
+        health.latency = latency if health.latency is None else \
+            self.ALPHA * latency + (1 - self.ALPHA) * health.latency
+
+        if health.ejected:
+            logger.info(f"Proxy '{health.label}' recovered and is back in rotation.")
+            health.ejected_until = 0.0
+            health.ejections = 0
+        health.probing = False
+
+    def record_failure(self, proxy: Optional[str]):
+        health = self._health.get(proxy)
+        if health is None:
+            return
+
+        health.requests += 1
+        health.failures += 1
+        health.consecutive_failures += 1
+        health.error_rate = self.ALPHA + (1 - self.ALPHA) * health.error_rate
+
+        if health.probing or (not health.ejected and health.consecutive_failures >= self.max_failures):
+            health.ejections += 1
+            cooldown = min(self.cooldown * 2 ** (health.ejections - 1), self.max_cooldown)
+            health.ejected_until = time.monotonic() + cooldown
+            logger.warning(
+                f"Proxy '{health.label}' ejected for {cooldown:.0f}s after "
+                f"{health.consecutive_failures} consecutive failures.")
+        health.probing = False
+
+    def get_stats(self) -> List[dict]:
+        """
+        Returns the health of every proxy, healthiest first.
+        """
+        return [
+            health.as_dict() for health in sorted(
+                self._health.values(),
+                key=lambda h: (h.ejected, h.error_rate, h.latency if h.latency is not None else float("inf"))
+            )
+        ]
@@ -0,0 +1,102 @@
+import time
+import asyncio
+from loguru import logger
+from typing import Optional
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP date.
+    Returns the seconds to wait, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    A token bucket whose refill rate adapts to the server's responses (AIMD).
+
+    Every second of healthy traffic adds about `ADDITIVE_INCREASE` requests per second
+    to the rate, so it creeps towards `max_rate` instead of bursting at the API (from 5
+    to 50 req/s takes a minute and a half). A throttled response (429, or a Retry-After)
+    cuts the rate by `DECREASE_FACTOR` and, when the server says how long to wait, holds
+    every caller back until then. Cuts are spaced by `DECREASE_COOLDOWN` so a burst of
+    429s from requests already in flight counts once.
+    """
+
+    ADDITIVE_INCREASE = 0.5  # Requests per second gained per second of healthy traffic
+    DECREASE_FACTOR = 0.5
+    DECREASE_COOLDOWN = 1.0  # Seconds between two rate cuts
+
+    def __init__(self, rate: float, min_rate: float = 0.5, max_rate: float = 50.0, burst: int = 5):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.burst = burst
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self._tokens + (now - self._updated_at) * self.rate, self.burst)
+        self._updated_at = now
+
+    async def acquire(self):
+        """
+        Waits for a token. Callers are served one at a time, in arrival order.
+        """
+        async with self._lock:
+            started = time.monotonic()
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+                else:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+            self.wait_seconds += time.monotonic() - started
+
+    def on_success(self):
+        self._refill(time.monotonic())
+        # Spread over the responses of one second, whatever the current rate
+        self.rate = min(self.rate + self.ADDITIVE_INCREASE / self.rate, self.max_rate)
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        now = time.monotonic()
+        self.throttled += 1
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._tokens = 0.0
+
+        if now - self._last_decrease < self.DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self._refill(now)
+        self.rate = max(self.rate * self.DECREASE_FACTOR, self.min_rate)
+        logger.warning(
+            f"Habbo API throttled the client, rate lowered to {self.rate:.2f} req/s"
+            + (f", pausing for {retry_after:.1f}s." if retry_after else "."))
+
+    def get_stats(self) -> dict:
+        return {
+            "rate": round(self.rate, 2),
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 2),
+        }
@@ -0,0 +1,101 @@
+import time
+import asyncio
+from src.helper.config import Config
+from src.helper.singleton import Singleton
+from src.controller.habbo.http.lanes import current_lane, LANES
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+@Singleton
+class SingleFlight:
+    """
+    Coalesces concurrent identical Habbo lookups.
+
+    Callers asking for the same resource key while a request for it is in flight
+    wait for that request and share its result, instead of sending their own. A
+    result is also kept for a short TTL, so a burst that arrives just after the
+    request finished is served without another call. None results are failures
+    and are never kept.
+
+    A request waits for its rate limiter token in the lane of the caller that sent
+    it, so callers only join requests of their own lane or a higher one: an
+    interactive lookup never queues behind a periodic one, it sends its own.
+
+    Attributes:
+        hits (int): Calls answered by a request in flight or a kept result.
+        misses (int): Calls that had to send their own request.
+    """
+
+    def __init__(self):
+        self.ttl = Config().habbo_single_flight_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._in_flight: Dict[Tuple[Hashable, str], asyncio.Future] = {}  # (key, lane) -> request
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the result of `func()` for `key`, sharing it with concurrent callers.
+
+        Args:
+            key (Hashable): The resource key, for example ("users", "name").
+            func (Callable): Sends the actual request when nothing can be shared.
+
+        Returns:
+            The result of the shared request.
+        """
+        now = time.monotonic()
+        cached = self._results.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                self.hits += 1
+                return cached[1]
+            del self._results[key]
+
+        lane = current_lane.get()
+        future = self._joinable(key, lane)
+        if future is not None:
+            self.hits += 1
+            # Shielded so a cancelled waiter doesn't cancel the request for everyone else
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        flight = (key, lane)
+        future = asyncio.ensure_future(func())
+        self._in_flight[flight] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._in_flight.pop(flight, None)
+            else:
+                future.add_done_callback(lambda _: self._in_flight.pop(flight, None))
+
+        if result is not None and self.ttl > 0:
+            self._results[key] = (time.monotonic() + self.ttl, result)
+            self._evict_expired()
+        return result
+
+    def _joinable(self, key: Hashable, lane: str) -> Optional[asyncio.Future]:
+        """
+        Returns the request in flight for `key` in `lane` or a higher one, highest first.
+        """
+        for flight_lane in LANES[:LANES.index(lane) + 1]:
+            future = self._in_flight.get((key, flight_lane))
+            if future is not None:
+                return future
+        return None
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._results.items() if expires_at <= now]:
+            del self._results[key]
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,118 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Set, Tuple
+from src.database.models.battleball import Match
+
+
+class BattleballStorage(ABC):
+    """
+    Storage operations the battleball worker, API and cogs rely on.
+
+    Leaderboard rows are ordered by total_score, then id, both descending.
+    Queue rows are ordered by their ID, which grows with every enqueue.
+    """
+
+    # Set by engines that support a write-behind stage, see `enable_write_behind`
+    write_behind = None
+
+    @abstractmethod
+    async def initialize(self):
+        """Prepares the storage for use."""
+
+    @abstractmethod
+    async def close(self):
+        """Flushes pending writes and releases the storage."""
+
+    @abstractmethod
+    async def enable_write_behind(self, max_pending: int, batch_size: int, flush_interval_ms: int):
+        """Routes worker writes through a grouped-commit stage, if the engine has one."""
+
+    @abstractmethod
+    async def flush_writes(self):
+        """Waits until every pending write-behind intent is stored."""
+
+    @abstractmethod
+    async def add_user(self, username: str) -> Optional[int]:
+        """Adds a user if missing. Returns the ID when the user already existed."""
+
+    @abstractmethod
+    async def get_user_id(self, username: str) -> Optional[int]:
+        """Returns the ID of a user, or None if the user is unknown."""
+
+    @abstractmethod
+    async def get_user_identity(self, user_id: int) -> Optional[Tuple[str, str]]:
+        """Returns the user's stored (unique_id, bouncer_player_id), or None if never resolved."""
+
+    @abstractmethod
+    async def set_user_identity(self, user_id: int, unique_id: Optional[str], bouncer_player_id: Optional[str]):
+        """Stores the user's resolved Habbo identity. None values clear it."""
+
+    @abstractmethod
+    async def get_history_head(self, user_id: int) -> Optional[str]:
+        """Returns the newest match ID every older match of the user is stored below, or None."""
+
+    @abstractmethod
+    async def set_history_head(self, user_id: int, match_id: str):
+        """Stores the user's history head, once every match down to the previous one is stored."""
+
+    @abstractmethod
+    async def record_matches(self, user_id: int, matches: List[Match]) -> int:
+        """Stores new matches and their score delta at once. Returns how many were new."""
+
+    async def add_match(self, match: Match):
+        await self.record_matches(match.user_id, [match])
+
+    @abstractmethod
+    async def get_match_ids(self, user_id: int) -> Set[str]:
+        """Returns the IDs of every match stored for the user."""
+
+    @abstractmethod
+    async def get_unprocessed_match_ids(self, user_id: int, match_ids: List[str]) -> List[str]:
+        """Returns the given match IDs not stored for the user yet, in their original order."""
+
+    @abstractmethod
+    async def add_to_queue(self, username: str, discord_id: int, lane: str = "manual") -> Optional[int]:
+        """Appends a user to the queue if missing, in a traffic lane. Returns their position."""
+
+    @abstractmethod
+    async def bulk_add_to_queue(self, usernames: List[str], discord_id: int, lane: str = "manual") -> List[str]:
+        """Appends several users to the queue in order, in a traffic lane. Returns the ones that were added."""
+
+    @abstractmethod
+    async def get_queue(self, limit: int = 0, offset: int = 0, include_discord_id: bool = True) -> List[dict]:
+        """Returns queue entries as dicts with username, position and optionally discord_id."""
+
+    @abstractmethod
+    async def seek_queue(self, limit: int, after: Optional[int] = None, offset: int = 0) -> List[Tuple]:
+        """Returns (id, username, discord_id) rows after the given queue ID, or from `offset`."""
+
+    @abstractmethod
+    async def get_next_in_queue(self, include_discord_id: bool = True) -> Optional[dict]:
+        """Returns the first queue entry with its lane, or None if the queue is empty."""
+
+    @abstractmethod
+    async def remove_from_queue(self, queue_id: int):
+        """Removes a queue entry by its ID."""
+
+    @abstractmethod
+    async def fulminate_user(self, username: str):
+        """Deletes a user with their matches and queue entry."""
+
+    @abstractmethod
+    async def get_total_queue_users(self) -> int:
+        """Returns the number of queued users."""
+
+    @abstractmethod
+    async def get_leaderboard(self, limit: int = 0, offset: int = 0) -> List[Tuple]:
+        """Returns (username, total_score, ranked_matches) rows."""
+
+    @abstractmethod
+    async def seek_leaderboard(self, limit: int, after: Optional[Tuple[int, int]] = None, offset: int = 0) -> List[Tuple]:
+        """Returns (id, username, total_score, ranked_matches) rows after a (total_score, id) key, or from `offset`."""
+
+    @abstractmethod
+    async def get_total_users(self) -> int:
+        """Returns the number of users."""
+
+    @abstractmethod
+    async def rebuild_user_stats(self, verify_only: bool = False) -> List[dict]:
+        """Recomputes user aggregates from their matches. Returns the users that had drifted."""
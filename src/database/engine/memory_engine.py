@@ -0,0 +1,248 @@
+import bisect
+import threading
+from loguru import logger
+from typing import Dict, List, Optional, Set, Tuple
+from src.database.engine.base import BattleballStorage
+from src.database.models.battleball import Match
+
+
+class MemoryBattleballStorage(BattleballStorage):
+    """
+    Battleball storage kept in dicts and sorted lists, with no disk I/O.
+
+    Meant for tests, load tests and benchmarks: nothing survives a restart.
+    A lock guards every operation because the FastAPI server reads from its own thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users: Dict[int, List] = {}  # id -> [username, total_score, ranked_matches]
+        self._user_ids: Dict[str, int] = {}
+        self._identities: Dict[int, Tuple[str, str]] = {}  # id -> (unique_id, bouncer_player_id)
+        self._history_heads: Dict[int, str] = {}  # id -> newest match ID of the complete history
+        self._leaderboard: List[Tuple[int, int]] = []  # sorted (-total_score, -id)
+        self._matches: Dict[int, Dict[str, Tuple[int, bool]]] = {}  # user id -> match id -> (score, ranked)
+        self._queue: Dict[int, Tuple[str, int]] = {}  # queue id -> (username, discord_id)
+        self._queue_ids: Dict[str, int] = {}
+        self._queue_order: List[int] = []  # sorted queue ids
+        self._queue_lanes: Dict[int, str] = {}  # queue id -> traffic lane
+        self._next_user_id = 1
+        self._next_queue_id = 1
+
+    async def initialize(self):
+        logger.debug("In-memory battleball storage initialized.")
+
+    async def close(self):
+        logger.debug(
+            f"In-memory battleball storage closed with {len(self._users)} users and {len(self._queue)} queued.")
+
+    async def enable_write_behind(self, max_pending: int, batch_size: int, flush_interval_ms: int):
+        """
+        Does nothing: writes land in memory right away, there is nothing to group.
+        """
+
+    async def flush_writes(self):
+        """
+        Does nothing, no write is ever pending.
+        """
+
+    async def add_user(self, username: str) -> Optional[int]:
+        username = username.lower()
+        with self._lock:
+            if username in self._user_ids:
+                return self._user_ids[username]
+
+            user_id = self._next_user_id
+            self._next_user_id += 1
+            self._users[user_id] = [username, 0, 0]
+            self._user_ids[username] = user_id
+            self._matches[user_id] = {}
+            bisect.insort(self._leaderboard, (0, -user_id))
+        logger.debug(f"User '{username}' added to the database.")
+
+    async def get_user_id(self, username: str) -> Optional[int]:
+        return self._user_ids.get(username.lower())
+
+    async def get_user_identity(self, user_id: int) -> Optional[Tuple[str, str]]:
+        return self._identities.get(user_id)
+
+    async def set_user_identity(self, user_id: int, unique_id: Optional[str], bouncer_player_id: Optional[str]):
+        with self._lock:
+            if user_id not in self._users:
+                return
+            if bouncer_player_id is None:
+                self._identities.pop(user_id, None)
+            else:
+                self._identities[user_id] = (unique_id, bouncer_player_id)
+
+    async def get_history_head(self, user_id: int) -> Optional[str]:
+        return self._history_heads.get(user_id)
+
+    async def set_history_head(self, user_id: int, match_id: str):
+        with self._lock:
+            if user_id in self._users:
+                self._history_heads[user_id] = match_id
+
+    async def record_matches(self, user_id: int, matches: List[Match]) -> int:
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                return 0
+
+            stored_matches = self._matches[user_id]
+            score_delta = ranked_delta = stored = 0
+            for match in matches:
+                if match.match_id in stored_matches:
+                    continue
+                stored_matches[match.match_id] = (match.game_score, match.ranked)
+                stored += 1
+                if match.ranked:
+                    score_delta += match.game_score
+                    ranked_delta += 1
+
+            if ranked_delta:
+                self._set_user_stats(user_id, user[1] + score_delta, user[2] + ranked_delta)
+        return stored
+
+    def _set_user_stats(self, user_id: int, total_score: int, ranked_matches: int):
+        user = self._users[user_id]
+        del self._leaderboard[bisect.bisect_left(self._leaderboard, (-user[1], -user_id))]
+        user[1], user[2] = total_score, ranked_matches
+        bisect.insort(self._leaderboard, (-total_score, -user_id))
+
+    async def get_match_ids(self, user_id: int) -> Set[str]:
+        with self._lock:
+            return set(self._matches.get(user_id, ()))
+
+    async def get_unprocessed_match_ids(self, user_id: int, match_ids: List[str]) -> List[str]:
+        stored_matches = self._matches.get(user_id, {})
+        return [match_id for match_id in match_ids if match_id not in stored_matches]
+
+    async def add_to_queue(self, username: str, discord_id: int, lane: str = "manual") -> Optional[int]:
+        username = username.lower()
+        with self._lock:
+            queue_id = self._enqueue(username, discord_id, lane)
+            return bisect.bisect_right(self._queue_order, queue_id)
+
+    async def bulk_add_to_queue(self, usernames: List[str], discord_id: int, lane: str = "manual") -> List[str]:
+        added = []
+        with self._lock:
+            for username in usernames:
+                username = username.lower()
+                if username not in self._queue_ids:
+                    self._enqueue(username, discord_id, lane)
+                    added.append(username)
+        return added
+
+    def _enqueue(self, username: str, discord_id: int, lane: str) -> int:
+        if username in self._queue_ids:
+            return self._queue_ids[username]
+
+        queue_id = self._next_queue_id
+        self._next_queue_id += 1
+        self._queue[queue_id] = (username, discord_id)
+        self._queue_lanes[queue_id] = lane
+        self._queue_ids[username] = queue_id
+        self._queue_order.append(queue_id)  # IDs only grow, so the list stays sorted
+        return queue_id
+
+    async def get_queue(self, limit: int = 0, offset: int = 0, include_discord_id: bool = True) -> List[dict]:
+        with self._lock:
+            offset = max(offset, 0)
+            queue_ids = self._queue_order[offset:offset + limit] if limit > 0 else self._queue_order[offset:]
+            entries = [(position, self._queue[queue_id]) for position, queue_id in enumerate(queue_ids, start=offset + 1)]
+
+        if include_discord_id:
+            return [{"username": username, "discord_id": discord_id, "position": position}
+                    for position, (username, discord_id) in entries]
+        return [{"username": username, "position": position} for position, (username, _) in entries]
+
+    async def seek_queue(self, limit: int, after: Optional[int] = None, offset: int = 0) -> List[Tuple]:
+        with self._lock:
+            start = bisect.bisect_right(self._queue_order, after) if after is not None else max(offset, 0)
+            queue_ids = self._queue_order[start:start + limit] if limit >= 0 else self._queue_order[start:]
+            return [(queue_id, *self._queue[queue_id]) for queue_id in queue_ids]
+
+    async def get_next_in_queue(self, include_discord_id: bool = True) -> Optional[dict]:
+        with self._lock:
+            if not self._queue_order:
+                return None
+            queue_id = self._queue_order[0]
+            username, discord_id = self._queue[queue_id]
+            lane = self._queue_lanes[queue_id]
+
+        if include_discord_id:
+            return {"id": queue_id, "username": username, "discord_id": discord_id, "position": 1, "lane": lane}
+        return {"id": queue_id, "username": username, "position": 1, "lane": lane}
+
+    async def remove_from_queue(self, queue_id: int):
+        with self._lock:
+            self._dequeue(queue_id)
+
+    def _dequeue(self, queue_id: int):
+        entry = self._queue.pop(queue_id, None)
+        if entry is None:
+            return
+        del self._queue_lanes[queue_id]
+        del self._queue_ids[entry[0]]
+        del self._queue_order[bisect.bisect_left(self._queue_order, queue_id)]
+
+    async def fulminate_user(self, username: str):
+        username = username.lower()
+        with self._lock:
+            user_id = self._user_ids.pop(username, None)
+            if user_id is None:
+                logger.warning(f"User '{username}' not found in the database.")
+                return
+
+            _, total_score, _ = self._users.pop(user_id)
+            del self._leaderboard[bisect.bisect_left(self._leaderboard, (-total_score, -user_id))]
+            del self._matches[user_id]
+            self._identities.pop(user_id, None)
+            self._history_heads.pop(user_id, None)
+            if username in self._queue_ids:
+                self._dequeue(self._queue_ids[username])
+        logger.debug(f"Fulminated user '{username}' with ID '{user_id}'.")
+
+    async def get_total_queue_users(self) -> int:
+        return len(self._queue)
+
+    async def get_leaderboard(self, limit: int = 0, offset: int = 0) -> List[Tuple]:
+        rows = await self.seek_leaderboard(limit if limit > 0 else -1, offset=offset)
+        return [row[1:] for row in rows]
+
+    async def seek_leaderboard(self, limit: int, after: Optional[Tuple[int, int]] = None, offset: int = 0) -> List[Tuple]:
+        with self._lock:
+            if after is not None:
+                start = bisect.bisect_right(self._leaderboard, (-after[0], -after[1]))
+            else:
+                start = max(offset, 0)
+            keys = self._leaderboard[start:start + limit] if limit >= 0 else self._leaderboard[start:]
+            return [(-negative_id, *self._users[-negative_id]) for _, negative_id in keys]
+
+    async def get_total_users(self) -> int:
+        return len(self._users)
+
+    async def rebuild_user_stats(self, verify_only: bool = False) -> List[dict]:
+        drift = []
+        with self._lock:
+            for user_id, (username, total_score, ranked_matches) in list(self._users.items()):
+                ranked_scores = [score for score, ranked in self._matches[user_id].values() if ranked]
+                expected_score, expected_ranked_matches = sum(ranked_scores), len(ranked_scores)
+                if (total_score, ranked_matches) == (expected_score, expected_ranked_matches):
+                    continue
+
+                drift.append({
+                    "id": user_id,
+                    "username": username,
+                    "stored_score": total_score,
+                    "expected_score": expected_score,
+                    "stored_ranked_matches": ranked_matches,
+                    "expected_ranked_matches": expected_ranked_matches,
+                })
+                if not verify_only:
+                    self._set_user_stats(user_id, expected_score, expected_ranked_matches)
+
+        logger.info(
+            f"{'Verified' if verify_only else 'Rebuilt'} user stats, {len(drift)} users had drifted.")
+        return drift
@@ -0,0 +1,517 @@
+import json
+import aiosqlite
+from loguru import logger
+from typing import Dict, List, Optional, Set, Tuple
+from src.database.engine.base import BattleballStorage
+from src.database.models.battleball import Match
+from src.database.migrations.runner import MigrationRunner
+from src.database.migrations.battleball import MIGRATIONS
+from src.database.connection.sqlite_pool import SQLiteConnectionPool
+from src.database.service.battleball_write_behind import BattleballWriteBehind
+
+USER_ID_QUERY = "SELECT id FROM users WHERE username = ?"
+
+USER_IDENTITY_QUERY = "SELECT unique_id, bouncer_player_id FROM users WHERE id = ?"
+
+HISTORY_HEAD_QUERY = "SELECT history_head FROM users WHERE id = ?"
+
+LEADERBOARD_QUERY = """
+    SELECT username, total_score, ranked_matches
+    FROM users
+    ORDER BY total_score DESC, id DESC
+    LIMIT ? OFFSET ?
+"""
+
+LEADERBOARD_PAGE_QUERY = """
+    SELECT id, username, total_score, ranked_matches
+    FROM users
+    ORDER BY total_score DESC, id DESC
+    LIMIT ? OFFSET ?
+"""
+
+LEADERBOARD_SEEK_QUERY = """
+    SELECT id, username, total_score, ranked_matches
+    FROM users
+    WHERE (total_score, id) < (?, ?)
+    ORDER BY total_score DESC, id DESC
+    LIMIT ?
+"""
+
+QUEUE_QUERY = """
+    SELECT username, discord_id
+    FROM queue
+    ORDER BY id
+    LIMIT ? OFFSET ?
+"""
+
+QUEUE_PAGE_QUERY = """
+    SELECT id, username, discord_id
+    FROM queue
+    ORDER BY id
+    LIMIT ? OFFSET ?
+"""
+
+QUEUE_SEEK_QUERY = """
+    SELECT id, username, discord_id
+    FROM queue
+    WHERE id > ?
+    ORDER BY id
+    LIMIT ?
+"""
+
+QUEUE_POSITION_QUERY = """
+    SELECT COUNT(*) FROM queue
+    WHERE id <= (SELECT id FROM queue WHERE username = ?)
+"""
+
+NEXT_IN_QUEUE_QUERY = "SELECT id, username, discord_id, lane FROM queue ORDER BY id LIMIT 1"
+
+USER_MATCH_IDS_QUERY = "SELECT match_id FROM matches WHERE user_id = ?"
+
+# Rows come back in no particular order, callers restore the order of the candidates
+UNPROCESSED_MATCHES_QUERY = """
+    SELECT candidates.value
+    FROM json_each(?) AS candidates
+    WHERE NOT EXISTS (
+        SELECT 1 FROM matches
+        WHERE matches.match_id = candidates.value AND matches.user_id = ?
+    )
+"""
+
+# Queries on the worker, API and panel paths that must be served by an index, as
+# (query, sample parameters, full scans the query is meant to do). The queue is read
+# in rowid order, which is its enqueue sequence, so walking it needs no index or sort.
+HOT_QUERIES = {
+    "user_id": (USER_ID_QUERY, ("",), ()),
+    "user_identity": (USER_IDENTITY_QUERY, (0,), ()),
+    "history_head": (HISTORY_HEAD_QUERY, (0,), ()),
+    "leaderboard": (LEADERBOARD_QUERY, (10, 0), ()),
+    "leaderboard_page": (LEADERBOARD_PAGE_QUERY, (10, 0), ()),
+    "leaderboard_seek": (LEADERBOARD_SEEK_QUERY, (0, 0, 10), ()),
+    "queue": (QUEUE_QUERY, (10, 0), ("SCAN queue",)),
+    "queue_page": (QUEUE_PAGE_QUERY, (10, 0), ("SCAN queue",)),
+    "queue_seek": (QUEUE_SEEK_QUERY, (0, 10), ()),
+    "queue_position": (QUEUE_POSITION_QUERY, ("",), ()),
+    "next_in_queue": (NEXT_IN_QUEUE_QUERY, (), ("SCAN queue",)),
+    "user_match_ids": (USER_MATCH_IDS_QUERY, (0,), ()),
+    "unprocessed_matches": (UNPROCESSED_MATCHES_QUERY, ("[]", 0), ()),
+}
+
+# Users whose stored aggregates differ from what their stored matches add up to
+USER_DRIFT_QUERY = """
+    WITH totals AS (
+        SELECT user_id,
+               SUM(CASE WHEN ranked THEN game_score ELSE 0 END) AS total_score,
+               SUM(CASE WHEN ranked THEN 1 ELSE 0 END) AS ranked_matches
+        FROM matches
+        GROUP BY user_id
+    )
+    SELECT users.id, users.username,
+           users.total_score, COALESCE(totals.total_score, 0),
+           users.ranked_matches, COALESCE(totals.ranked_matches, 0)
+    FROM users
+    LEFT JOIN totals ON totals.user_id = users.id
+    WHERE users.total_score IS NOT COALESCE(totals.total_score, 0)
+       OR users.ranked_matches IS NOT COALESCE(totals.ranked_matches, 0)
+"""
+
+
+class SQLiteBattleballStorage(BattleballStorage):
+    """
+    Battleball storage on a SQLite file, through a pool of long-lived aiosqlite connections.
+    """
+
+    def __init__(self, db_path: str = 'src/database/storage/battleball.db'):
+        self.db_path = db_path
+        self.pool = SQLiteConnectionPool(db_path)
+        self.write_behind: Optional[BattleballWriteBehind] = None
+
+    async def initialize(self):
+        version = await MigrationRunner(self.db_path, MIGRATIONS).run()
+        await self.pool.open()
+        logger.debug(
+            f"Database initialized with tables: users, queue, matches (schema version '{version}')")
+        await self.check_query_plans()
+
+    async def check_query_plans(self) -> bool:
+        """
+        Runs EXPLAIN QUERY PLAN over the hot queries and warns about any that scan
+        a table or sort without an index.
+        """
+        all_indexed = True
+        for name, details in (await self.get_unindexed_steps()).items():
+            all_indexed = False
+            logger.warning(
+                f"Query '{name}' is not fully indexed: {'; '.join(details)}")
+        return all_indexed
+
+    async def get_unindexed_steps(self) -> Dict[str, List[str]]:
+        """
+        Returns the plan steps of each hot query that scan a table or sort without
+        an index, leaving out the full scans the query declares.
+        """
+        unindexed = {}
+        for name, (query, params, allowed_scans) in HOT_QUERIES.items():
+            plan = await self.pool.reader().execute_fetchall(f"EXPLAIN QUERY PLAN {query}", params)
+            details = [
+                row[3] for row in plan
+                if row[3] not in allowed_scans and not self.is_indexed_step(row[3])
+            ]
+            if details:
+                unindexed[name] = details
+        return unindexed
+
+    @staticmethod
+    def is_indexed_step(detail: str) -> bool:
+        if "TEMP B-TREE" in detail:
+            return False
+        if detail.startswith(("SCAN", "SEARCH")):
+            return "INDEX" in detail or "PRIMARY KEY" in detail
+        return True
+
+    async def enable_write_behind(self, max_pending: int, batch_size: int, flush_interval_ms: int):
+        """
+        Routes worker writes through a single writer task that commits them in
+        grouped transactions. See `BattleballWriteBehind`.
+        """
+        if self.write_behind is None:
+            self.write_behind = BattleballWriteBehind(self, max_pending, batch_size, flush_interval_ms)
+            await self.write_behind.start()
+
+    async def flush_writes(self):
+        """
+        Waits until every pending write-behind intent is committed. Does nothing
+        when write-behind is disabled, since writes are then committed right away.
+        """
+        if self.write_behind is not None:
+            await self.write_behind.flush()
+
+    async def close(self):
+        if self.write_behind is not None:
+            await self.write_behind.close()
+            self.write_behind = None
+        await self.pool.close()
+
+    async def add_user(self, username: str):
+        username = username.lower()
+        async with self.pool.transaction() as db:
+            async with db.execute(USER_ID_QUERY, (username,)) as cursor:
+                row = await cursor.fetchone()
+                if row:
+                    logger.debug(
+                        f"User '{username}' already exists in the database with ID '{row[0]}'.")
+                    return row[0]
+                else:
+                    await db.execute("""
+                        INSERT INTO users (username)
+                        VALUES (?)
+                    """, (username,))
+                    logger.debug(f"User '{username}' added to the database.")
+
+    async def get_user_id(self, username: str) -> Optional[int]:
+        username = username.lower()
+        async with self.pool.reader().execute(USER_ID_QUERY, (username,)) as cursor:
+            row = await cursor.fetchone()
+            if row:
+                logger.debug(
+                    f"User ID '{row[0]}' found for username '{username}'.")
+            else:
+                logger.warning(
+                    f"No User ID found for username '{username}'.")
+            return row[0] if row else None
+
+    async def get_user_identity(self, user_id: int) -> Optional[Tuple[str, str]]:
+        rows = await self.pool.reader().execute_fetchall(USER_IDENTITY_QUERY, (user_id,))
+        if not rows or rows[0][1] is None:
+            return None
+        return rows[0][0], rows[0][1]
+
+    async def set_user_identity(self, user_id: int, unique_id: Optional[str], bouncer_player_id: Optional[str]):
+        async with self.pool.transaction() as db:
+            await db.execute(
+                "UPDATE users SET unique_id = ?, bouncer_player_id = ? WHERE id = ?",
+                (unique_id, bouncer_player_id, user_id))
+
+    async def get_history_head(self, user_id: int) -> Optional[str]:
+        rows = await self.pool.reader().execute_fetchall(HISTORY_HEAD_QUERY, (user_id,))
+        return rows[0][0] if rows else None
+
+    async def set_history_head(self, user_id: int, match_id: str):
+        async with self.pool.transaction() as db:
+            await self._set_history_heads(db, {user_id: match_id})
+
+    async def _set_history_heads(self, db: aiosqlite.Connection, heads: Dict[int, str]):
+        await db.executemany(
+            "UPDATE users SET history_head = ? WHERE id = ?",
+            [(match_id, user_id) for user_id, match_id in heads.items()])
+
+    async def record_matches(self, user_id: int, matches: List[Match]) -> int:
+        """
+        Stores a batch of matches for a user and applies the aggregated score and
+        ranked-match delta in a single transaction. Matches already stored for the
+        user are skipped and don't count towards the delta, so replaying a batch
+        is harmless.
+
+        Returns the number of newly stored matches.
+        """
+        if not matches:
+            return 0
+
+        async with self.pool.transaction() as db:
+            stored = await self._record_matches(db, user_id, matches)
+
+        logger.debug(
+            f"Recorded {stored} new matches out of {len(matches)} for user ID '{user_id}'.")
+        return stored
+
+    async def _record_matches(self, db: aiosqlite.Connection, user_id: int, matches: List[Match]) -> int:
+        """
+        Runs the statements of `record_matches` on an open writer transaction, so
+        the write-behind stage can group several batches into one commit.
+        """
+        await db.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS incoming_matches (
+                match_id TEXT PRIMARY KEY,
+                game_score INTEGER,
+                ranked BOOLEAN
+            )
+        """)
+        await db.execute("DELETE FROM incoming_matches")
+        await db.executemany("""
+            INSERT OR IGNORE INTO incoming_matches (match_id, game_score, ranked)
+            VALUES (?, ?, ?)
+        """, [(match.match_id, match.game_score, match.ranked) for match in matches])
+
+        # Only matches that aren't stored yet may contribute to the delta
+        await db.execute("""
+            DELETE FROM incoming_matches
+            WHERE EXISTS (
+                SELECT 1 FROM matches
+                WHERE matches.match_id = incoming_matches.match_id AND matches.user_id = ?
+            )
+        """, (user_id,))
+        await db.execute("""
+            INSERT INTO matches (match_id, user_id, game_score, ranked)
+            SELECT match_id, ?, game_score, ranked FROM incoming_matches
+        """, (user_id,))
+        await db.execute("""
+            UPDATE users
+            SET total_score = total_score + (SELECT COALESCE(SUM(game_score), 0) FROM incoming_matches WHERE ranked),
+                ranked_matches = ranked_matches + (SELECT COUNT(*) FROM incoming_matches WHERE ranked)
+            WHERE id = ?
+        """, (user_id,))
+        async with db.execute("SELECT COUNT(*) FROM incoming_matches") as cursor:
+            (stored,) = await cursor.fetchone()
+        return stored
+
+    async def get_match_ids(self, user_id: int) -> Set[str]:
+        """
+        Returns the IDs of every match stored for the user.
+        """
+        rows = await self.pool.reader().execute_fetchall(USER_MATCH_IDS_QUERY, (user_id,))
+        return {row[0] for row in rows}
+
+    async def get_unprocessed_match_ids(self, user_id: int, match_ids: List[str]) -> List[str]:
+        """
+        Returns the given match IDs that were never stored for the user, ranked or not,
+        keeping their original order. The candidates are passed as one JSON array and
+        anti-joined against the matches table inside SQLite.
+        """
+        if not match_ids:
+            return []
+
+        rows = await self.pool.reader().execute_fetchall(
+            UNPROCESSED_MATCHES_QUERY, (json.dumps(match_ids), user_id))
+        # Ordering in Python spares SQLite a temporary B-tree per page
+        unprocessed = {row[0] for row in rows}
+        new_match_ids = [match_id for match_id in match_ids if match_id in unprocessed]
+
+        logger.debug(
+            f"Found {len(new_match_ids)} unprocessed matches out of {len(match_ids)} for user ID '{user_id}'.")
+        return new_match_ids
+
+    async def add_to_queue(self, username: str, discord_id: int, lane: str = "manual") -> Optional[int]:
+        """
+        Appends a user to the queue and returns their position. Queue rows are
+        ordered by their autoincrement ID, so positions are derived on read and
+        nothing has to be renumbered when a row leaves the queue.
+        """
+        username = username.lower()
+        async with self.pool.transaction() as db:
+            cursor = await db.execute("""
+                INSERT INTO queue (username, discord_id, lane)
+                VALUES (?, ?, ?)
+                ON CONFLICT(username) DO NOTHING
+            """, (username, discord_id, lane))
+            added = cursor.rowcount > 0
+            await cursor.close()
+
+            async with db.execute(QUEUE_POSITION_QUERY, (username,)) as cursor:
+                (position,) = await cursor.fetchone()
+
+        if added:
+            logger.debug(
+                f"User '{username}' added to the queue at position '{position}'.")
+        else:
+            logger.debug(
+                f"User '{username}' is already in the queue at position '{position}'")
+        return position
+
+    async def bulk_add_to_queue(self, usernames: List[str], discord_id: int, lane: str = "manual") -> List[str]:
+        """
+        Appends several users to the queue in one statement and one transaction,
+        keeping the given order. Users already queued are left where they are.
+
+        Returns the usernames that were actually added.
+        """
+        if not usernames:
+            return []
+
+        async with self.pool.transaction() as db:
+            async with db.execute("""
+                INSERT INTO queue (username, discord_id, lane)
+                SELECT lower(value), ?, ? FROM json_each(?) WHERE true ORDER BY key
+                ON CONFLICT(username) DO NOTHING
+                RETURNING username
+            """, (discord_id, lane, json.dumps(usernames))) as cursor:
+                added = [row[0] for row in await cursor.fetchall()]
+
+        logger.debug(
+            f"Added {len(added)} out of {len(usernames)} users to the queue.")
+        return added
+
+    async def get_queue(self, limit: int = 0, offset: int = 0, include_discord_id: bool = True):
+        # SQLite treats a negative LIMIT as no limit
+        offset = max(offset, 0)
+        rows = await self.pool.reader().execute_fetchall(QUEUE_QUERY, (limit if limit > 0 else -1, offset))
+        # Positions follow from the rowid order, no window function needed
+        if include_discord_id:
+            return [
+                {"username": username, "discord_id": discord_id, "position": offset + idx}
+                for idx, (username, discord_id) in enumerate(rows, start=1)
+            ]
+        return [{"username": username, "position": offset + idx} for idx, (username, _) in enumerate(rows, start=1)]
+
+    async def seek_queue(self, limit: int, after: Optional[int] = None, offset: int = 0):
+        """
+        Returns up to `limit` queue rows as (id, username, discord_id) tuples. With
+        `after` set, the page starts right after that queue ID with an index seek,
+        so deep pages cost the same as the first one; otherwise `offset` is used.
+        """
+        if after is not None:
+            return await self.pool.reader().execute_fetchall(QUEUE_SEEK_QUERY, (after, limit))
+
+        return await self.pool.reader().execute_fetchall(QUEUE_PAGE_QUERY, (limit, max(offset, 0)))
+
+    async def get_next_in_queue(self, include_discord_id: bool = True) -> Optional[dict]:
+        async with self.pool.reader().execute(NEXT_IN_QUEUE_QUERY) as cursor:
+            row = await cursor.fetchone()
+            if row:
+                if include_discord_id:
+                    logger.debug(
+                        f"Next in queue: ID '{row[0]}', Username '{row[1]}', Discord ID '{row[2]}', Position '1'")
+                    return {"id": row[0], "username": row[1], "discord_id": row[2], "position": 1, "lane": row[3]}
+                else:
+                    logger.debug(
+                        f"Next in queue: ID '{row[0]}', Username '{row[1]}', Position '1'")
+                    return {"id": row[0], "username": row[1], "position": 1, "lane": row[3]}
+            logger.debug("Queue is empty.")
+            return None
+
+    async def remove_from_queue(self, queue_id: int):
+        async with self.pool.transaction() as db:
+            await self._remove_from_queue(db, [queue_id])
+        logger.debug(f"Removed queue item with ID '{queue_id}'.")
+
+    async def _remove_from_queue(self, db: aiosqlite.Connection, queue_ids: List[int]):
+        await db.executemany("DELETE FROM queue WHERE id = ?", [(queue_id,) for queue_id in queue_ids])
+
+    async def fulminate_user(self, username: str):
+        # Delete the user and everything related to them in every table
+        username = username.lower()
+        user_id = await self.get_user_id(username)
+        if user_id:
+            async with self.pool.transaction() as db:
+                await db.execute("DELETE FROM users WHERE id = ?", (user_id,))
+                await db.execute("DELETE FROM queue WHERE username = ?", (username,))
+                await db.execute("DELETE FROM matches WHERE user_id = ?", (user_id,))
+            logger.debug(
+                f"Fulminated user '{username}' with ID '{user_id}'.")
+        else:
+            logger.warning(f"User '{username}' not found in the database.")
+
+    async def get_total_queue_users(self) -> int:
+        async with self.pool.reader().execute("SELECT COUNT(*) FROM queue") as cursor:
+            (count,) = await cursor.fetchone()
+            return count
+
+    async def get_leaderboard(self, limit: int = 0, offset: int = 0):
+        # SQLite treats a negative LIMIT as no limit
+        return await self.pool.reader().execute_fetchall(
+            LEADERBOARD_QUERY, (limit if limit > 0 else -1, max(offset, 0)))
+
+    async def seek_leaderboard(self, limit: int, after: Optional[Tuple[int, int]] = None, offset: int = 0):
+        """
+        Returns up to `limit` leaderboard rows as (id, username, total_score, ranked_matches)
+        tuples. With `after` set to the (total_score, id) of the last row already shown,
+        the page starts with an index seek, so deep pages cost the same as the first
+        one; otherwise `offset` is used.
+        """
+        if after is not None:
+            return await self.pool.reader().execute_fetchall(LEADERBOARD_SEEK_QUERY, (*after, limit))
+
+        return await self.pool.reader().execute_fetchall(LEADERBOARD_PAGE_QUERY, (limit, max(offset, 0)))
+
+    async def rebuild_user_stats(self, verify_only: bool = False) -> List[dict]:
+        """
+        Recomputes every user's total_score and ranked_matches from the matches table
+        with one GROUP BY and returns the users whose stored values had drifted.
+        With `verify_only` set, the drift is only reported and nothing is written.
+        """
+        # Pending write-behind deltas must land first or they would show up as drift
+        await self.flush_writes()
+
+        if verify_only:
+            rows = await self.pool.reader().execute_fetchall(USER_DRIFT_QUERY)
+        else:
+            async with self.pool.transaction() as db:
+                await db.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS user_drift (
+                        id INTEGER PRIMARY KEY,
+                        username TEXT,
+                        stored_score INTEGER,
+                        expected_score INTEGER,
+                        stored_ranked_matches INTEGER,
+                        expected_ranked_matches INTEGER
+                    )
+                """)
+                await db.execute("DELETE FROM user_drift")
+                await db.execute(f"INSERT INTO user_drift {USER_DRIFT_QUERY}")
+                await db.execute("""
+                    UPDATE users
+                    SET total_score = user_drift.expected_score,
+                        ranked_matches = user_drift.expected_ranked_matches
+                    FROM user_drift
+                    WHERE user_drift.id = users.id
+                """)
+                rows = await db.execute_fetchall("SELECT * FROM user_drift ORDER BY id")
+
+        drift = [
+            {
+                "id": row[0],
+                "username": row[1],
+                "stored_score": row[2],
+                "expected_score": row[3],
+                "stored_ranked_matches": row[4],
+                "expected_ranked_matches": row[5],
+            }
+            for row in rows
+        ]
+        logger.info(
+            f"{'Verified' if verify_only else 'Rebuilt'} user stats, {len(drift)} users had drifted.")
+        return drift
+
+    async def get_total_users(self) -> int:
+        async with self.pool.reader().execute("SELECT COUNT(*) FROM users") as cursor:
+            (count,) = await cursor.fetchone()
+            return count
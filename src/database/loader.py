@@ -1,6 +1,8 @@
 import traceback
 from loguru import logger
+from src.helper.config import Config
 from src.helper.singleton import Singleton
+from src.database.service.match_payload_store import MatchPayloadStore
 from src.database.service.battleball_service import BattleballDatabaseService
 
 
@@ -11,7 +13,15 @@ class DatabaseLoader:
     """
 
     def __init__(self) -> None:
-        self.battleball_db_service = BattleballDatabaseService()
+        self.config = Config()
+        self.battleball_db_service = BattleballDatabaseService(
+            self.config.battleball_db_path,
+            self.config.battleball_storage_engine
+        )
+        self.match_payload_store = MatchPayloadStore(
+            self.config.match_payload_db_path,
+            self.config.match_payload_max_mb * 1024 * 1024
+        )
 
     async def setup(self) -> None:
         """
@@ -19,6 +29,23 @@ class DatabaseLoader:
         """
         try:
             await self.battleball_db_service.initialize()
+            if self.config.battleball_write_behind:
+                await self.battleball_db_service.enable_write_behind(
+                    self.config.battleball_write_behind_max_pending,
+                    self.config.battleball_write_behind_batch_size,
+                    self.config.battleball_write_behind_interval_ms
+                )
+            await self.match_payload_store.initialize()
         except Exception as e:
             logger.critical(f"Error setting up database(s): {e}")
             traceback.print_exc()
+
+    async def close(self) -> None:
+        """
+        Flushes pending writes and closes the long-lived database connections.
+        """
+        try:
+            await self.battleball_db_service.close()
+            await self.match_payload_store.close()
+        except Exception as e:
+            logger.critical(f"Error closing database(s): {e}")
@@ -0,0 +1,73 @@
+from typing import List
+from src.database.migrations.runner import Migration
+
+MIGRATIONS: List[Migration] = [
+    (1, "create users, queue and matches tables", [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY,
+            username TEXT UNIQUE,
+            total_score INTEGER DEFAULT 0,
+            ranked_matches INTEGER DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE,
+            discord_id INTEGER,
+            position INTEGER,
+            UNIQUE(username)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS matches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_id TEXT,
+            user_id INTEGER,
+            game_score INTEGER,
+            ranked BOOLEAN,
+            FOREIGN KEY(user_id) REFERENCES users(id),
+            UNIQUE(match_id, user_id)
+        )
+        """,
+    ]),
+    (2, "index leaderboard, queue and matches lookups", [
+        "CREATE INDEX IF NOT EXISTS idx_users_leaderboard ON users(total_score DESC, username, ranked_matches)",
+        "CREATE INDEX IF NOT EXISTS idx_queue_position ON queue(position)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_user_ranked ON matches(user_id, ranked, match_id)",
+    ]),
+    (3, "order the queue by its enqueue sequence instead of a stored position", [
+        """
+        CREATE TABLE queue_by_sequence (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE,
+            discord_id INTEGER
+        )
+        """,
+        """
+        INSERT INTO queue_by_sequence (username, discord_id)
+        SELECT username, discord_id FROM queue ORDER BY position, id
+        """,
+        "DROP TABLE queue",
+        "ALTER TABLE queue_by_sequence RENAME TO queue",
+    ]),
+    (4, "break leaderboard ties by id so it can be paged with a cursor", [
+        "DROP INDEX IF EXISTS idx_users_leaderboard",
+        "CREATE INDEX idx_users_leaderboard ON users(total_score DESC, id DESC, username, ranked_matches)",
+    ]),
+    (5, "cover per-user match aggregates with an index", [
+        "DROP INDEX IF EXISTS idx_matches_user_ranked",
+        "CREATE INDEX idx_matches_user_totals ON matches(user_id, ranked, game_score)",
+    ]),
+    (6, "remember each user's Habbo uniqueId and bouncerPlayerId", [
+        "ALTER TABLE users ADD COLUMN unique_id TEXT",
+        "ALTER TABLE users ADD COLUMN bouncer_player_id TEXT",
+    ]),
+    (7, "remember which traffic lane each queued job belongs to", [
+        "ALTER TABLE queue ADD COLUMN lane TEXT NOT NULL DEFAULT 'manual'",
+    ]),
+    (8, "remember how far back each user's match history is complete", [
+        "ALTER TABLE users ADD COLUMN history_head TEXT",
+    ]),
+]
@@ -0,0 +1,18 @@
+from typing import List
+from src.database.migrations.runner import Migration
+
+MIGRATIONS: List[Migration] = [
+    (1, "create the compressed match payload table", [
+        """
+        CREATE TABLE IF NOT EXISTS match_payloads (
+            id INTEGER PRIMARY KEY,
+            match_id TEXT UNIQUE NOT NULL,
+            payload BLOB NOT NULL,
+            raw_size INTEGER NOT NULL,
+            stored_size INTEGER NOT NULL,
+            last_access INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_match_payloads_last_access ON match_payloads(last_access)",
+    ]),
+]
@@ -0,0 +1,60 @@
+import aiosqlite
+from loguru import logger
+from typing import List, Tuple
+
+# (version, description, statements)
+Migration = Tuple[int, str, List[str]]
+
+
+class MigrationRunner:
+    """
+    Applies ordered schema migrations and records each one in a `schema_version` table,
+    so existing database files are upgraded in place at startup.
+
+    Runs on its own connection before the service pool is opened, so pooled
+    connections never start out with a cached pre-migration schema.
+    """
+
+    def __init__(self, db_path: str, migrations: List[Migration]):
+        self.db_path = db_path
+        self.migrations = sorted(migrations, key=lambda migration: migration[0])
+
+    async def get_current_version(self, db: aiosqlite.Connection) -> int:
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        async with db.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version") as cursor:
+            (version,) = await cursor.fetchone()
+        return version
+
+    async def run(self) -> int:
+        async with aiosqlite.connect(self.db_path) as db:
+            current_version = await self.get_current_version(db)
+
+            for version, description, statements in self.migrations:
+                if version <= current_version:
+                    continue
+
+                # Each migration runs in its own explicit transaction so a failing step
+                # leaves the schema at the previous version
+                try:
+                    await db.execute("BEGIN")
+                    for statement in statements:
+                        await db.execute(statement)
+                    await db.execute(
+                        "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                        (version, description))
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+
+                current_version = version
+                logger.info(
+                    f"Applied migration '{version}' ({description}) to '{self.db_path}'.")
+
+        return current_version
@@ -0,0 +1,150 @@
+import time
+import asyncio
+from loguru import logger
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from src.database.models.battleball import Match
+
+# Tells the writer task to commit what it holds right away instead of waiting for the interval
+_FLUSH = object()
+
+
+class BattleballWriteBehind:
+    """
+    Opt-in write-behind stage for worker writes.
+
+    Producers enqueue write intents (match batches with their score deltas, history
+    heads, queue removals) on a bounded queue, and a single writer task drains it, committing
+    once `batch_size` intents are pending or `flush_interval_ms` has passed since
+    the first one. Producers wait when the queue is full, which keeps ingestion
+    from outrunning the disk.
+
+    A history head claims every older match of the user is stored, so it is dropped
+    when a batch of that user's matches failed to commit before it.
+    """
+
+    def __init__(self, storage, max_pending: int = 1000, batch_size: int = 200, flush_interval_ms: int = 250):
+        self.storage = storage
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+
+        self.commits = 0
+        self.intents_written = 0
+        self.matches_written = 0
+        self.failed_commits = 0
+        self.commit_seconds = 0.0
+        self._failed_users = set()  # Users with matches lost to a failed commit since their last history head
+
+    async def start(self):
+        # The queue is created here so it belongs to the loop the worker runs on
+        self.queue = asyncio.Queue(maxsize=self.max_pending)
+        self.task = asyncio.create_task(self._run())
+        logger.debug(
+            f"Write-behind started (max pending {self.max_pending}, batch {self.batch_size}, "
+            f"interval {self.flush_interval * 1000:.0f}ms).")
+
+    async def record_matches(self, user_id: int, matches: List[Match]):
+        if matches:
+            await self.queue.put(("matches", user_id, matches))
+
+    async def set_history_head(self, user_id: int, match_id: str):
+        await self.queue.put(("history_head", user_id, match_id))
+
+    async def remove_from_queue(self, queue_id: int):
+        await self.queue.put(("dequeue", queue_id))
+
+    async def flush(self):
+        """
+        Waits until every intent enqueued so far is committed.
+        """
+        await self.queue.put(_FLUSH)
+        await self.queue.join()
+
+    async def close(self):
+        if self.task is None:
+            return
+
+        await self.flush()
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+        logger.info(f"Write-behind stopped: {self.get_stats()}")
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "commits": self.commits,
+            "intents_written": self.intents_written,
+            "matches_written": self.matches_written,
+            "failed_commits": self.failed_commits,
+            "pending": self.queue.qsize() if self.queue else 0,
+            "avg_commit_ms": round(self.commit_seconds / self.commits * 1000, 3) if self.commits else 0,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+
+            while batch[-1] is not _FLUSH and len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            intents = [intent for intent in batch if intent is not _FLUSH]
+            try:
+                if intents:
+                    await self._commit(intents)
+            except Exception as e:
+                # Nothing is lost for good: the user's history head stays where it was,
+                # so the next refresh pages back to it and finds the unstored matches
+                # again, and a queue row that wasn't removed is retried
+                self._failed_users.update(intent[1] for intent in intents if intent[0] == "matches")
+                self.failed_commits += 1
+                logger.error(f"Write-behind failed to commit {len(intents)} intents: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _commit(self, intents: List[Tuple]):
+        matches_by_user: Dict[int, List[Match]] = defaultdict(list)
+        heads: Dict[int, str] = {}
+        dequeued: List[int] = []
+        for intent in intents:
+            if intent[0] == "matches":
+                matches_by_user[intent[1]].extend(intent[2])
+            elif intent[0] == "history_head":
+                if intent[1] in self._failed_users:
+                    self._failed_users.discard(intent[1])
+                    logger.warning(f"Dropped the history head of user ID '{intent[1]}' after a failed commit.")
+                else:
+                    heads[intent[1]] = intent[2]
+            else:
+                dequeued.append(intent[1])
+
+        start = time.perf_counter()
+        stored = 0
+        async with self.storage.pool.transaction() as db:
+            for user_id, matches in matches_by_user.items():
+                stored += await self.storage._record_matches(db, user_id, matches)
+            if heads:
+                await self.storage._set_history_heads(db, heads)
+            if dequeued:
+                await self.storage._remove_from_queue(db, dequeued)
+
+        self.commit_seconds += time.perf_counter() - start
+        self.commits += 1
+        self.intents_written += len(intents)
+        self.matches_written += stored
+        logger.debug(
+            f"Write-behind committed {len(intents)} intents ({stored} new matches, {len(dequeued)} dequeued).")
@@ -0,0 +1,201 @@
+import json
+import time
+import zlib
+from loguru import logger
+from typing import Dict, List, Optional, Tuple
+from src.helper.singleton import Singleton
+from src.database.migrations.runner import MigrationRunner
+from src.database.migrations.match_payloads import MIGRATIONS
+from src.database.connection.sqlite_pool import SQLiteConnectionPool
+
+
+@Singleton
+class MatchPayloadStore:
+    """
+    Local store of raw `/matches/v1/{match_id}` responses, zlib-compressed in a SQLite file.
+
+    A finished match never changes, so its payload can be served from here instead of the API.
+    The store keeps a running total of the compressed bytes it holds, and once that
+    goes over `max_bytes` it evicts the least recently used payloads down to
+    `EVICTION_TARGET` of the limit. A `max_bytes` of 0 disables the store, which
+    then misses on every read and drops every write.
+
+    Reads stay off the writer: access times only need to be right to within
+    `ACCESS_GRANULARITY` for eviction, so a hit buffers one only when the stored time
+    is older than that, and buffered times are written in one batch with the next
+    write, or once `ACCESS_FLUSH_SIZE` are pending.
+    """
+
+    COMPRESSION_LEVEL = 6
+    EVICTION_TARGET = 0.9  # Share of max_bytes to evict down to, so eviction doesn't run on every write
+    ACCESS_GRANULARITY = 3600  # Seconds an access time may lag behind
+    ACCESS_FLUSH_SIZE = 500  # Buffered access times written at once
+
+    def __init__(self, db_path: str = 'src/database/storage/match_payloads.db', max_bytes: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.pool = SQLiteConnectionPool(db_path, readers=1)
+
+        self.payloads = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._accessed: Dict[str, int] = {}  # match_id -> access time not written yet
+
+    @property
+    def is_open(self) -> bool:
+        return self.pool.is_open
+
+    async def initialize(self):
+        if self.max_bytes <= 0:
+            logger.debug("Match payload store disabled.")
+            return
+
+        await MigrationRunner(self.db_path, MIGRATIONS).run()
+        await self.pool.open()
+        rows = await self.pool.reader().execute_fetchall(
+            "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM match_payloads")
+        self.payloads, self.raw_bytes, self.stored_bytes = rows[0]
+        logger.debug(
+            f"Match payload store opened with {self.payloads} payloads, "
+            f"{self.stored_bytes / 1024 / 1024:.1f} MB of {self.max_bytes / 1024 / 1024:.0f} MB.")
+
+    async def close(self):
+        if self.is_open:
+            await self.flush_access_times()
+        await self.pool.close()
+
+    async def get(self, match_id: str) -> Optional[dict]:
+        """
+        Returns the stored payload of a match, or None if it isn't stored. A payload
+        that can't be decoded anymore is deleted and counts as a miss.
+        """
+        if not self.is_open:
+            return None
+
+        rows = await self.pool.reader().execute_fetchall(
+            "SELECT payload, last_access FROM match_payloads WHERE match_id = ?", (match_id,))
+        if not rows:
+            self.misses += 1
+            return None
+
+        try:
+            payload = json.loads(zlib.decompress(rows[0][0]))
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Dropping corrupt stored payload of match '{match_id}': {e}")
+            await self.delete(match_id)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        now = int(time.time())
+        if now - rows[0][1] >= self.ACCESS_GRANULARITY:
+            self._accessed[match_id] = now
+            if len(self._accessed) >= self.ACCESS_FLUSH_SIZE:
+                await self.flush_access_times()
+        return payload
+
+    async def delete(self, match_id: str):
+        """
+        Removes the stored payload of a match, like one that no longer validates.
+        """
+        if not self.is_open:
+            return
+
+        self._accessed.pop(match_id, None)
+        async with self.pool.transaction() as db:
+            async with db.execute(
+                "DELETE FROM match_payloads WHERE match_id = ? RETURNING raw_size, stored_size", (match_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        if row:
+            self.payloads -= 1
+            self.raw_bytes -= row[0]
+            self.stored_bytes -= row[1]
+
+    async def flush_access_times(self):
+        """
+        Writes the buffered access times.
+        """
+        if not self._accessed:
+            return
+
+        async with self.pool.transaction() as db:
+            await self._write_access_times(db)
+
+    async def _write_access_times(self, db):
+        accessed, self._accessed = self._accessed, {}
+        await db.executemany(
+            "UPDATE match_payloads SET last_access = ? WHERE match_id = ?",
+            [(last_access, match_id) for match_id, last_access in accessed.items()])
+
+    async def put(self, match_id: str, payload: dict):
+        """
+        Stores the payload of a finished match. A match that is already stored is left as is.
+        """
+        if not self.is_open:
+            return
+
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        compressed = zlib.compress(raw, self.COMPRESSION_LEVEL)
+        evicted = []
+        # The running totals only change once the transaction is committed
+        async with self.pool.transaction() as db:
+            cursor = await db.execute("""
+                INSERT INTO match_payloads (match_id, payload, raw_size, stored_size, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(match_id) DO NOTHING
+            """, (match_id, compressed, len(raw), len(compressed), int(time.time())))
+            inserted = cursor.rowcount > 0
+
+            # Rides along with the write, and lands before eviction picks what to drop
+            if self._accessed:
+                await self._write_access_times(db)
+            stored_bytes = self.stored_bytes + (len(compressed) if inserted else 0)
+            if stored_bytes > self.max_bytes:
+                evicted = await self._evict(db, stored_bytes)
+
+        if inserted:
+            self.payloads += 1
+            self.raw_bytes += len(raw)
+            self.stored_bytes += len(compressed)
+        if evicted:
+            self.payloads -= len(evicted)
+            self.raw_bytes -= sum(raw_size for raw_size, _ in evicted)
+            self.stored_bytes -= sum(stored_size for _, stored_size in evicted)
+            self.evictions += len(evicted)
+            logger.debug(
+                f"Evicted {len(evicted)} match payloads, {self.stored_bytes / 1024 / 1024:.1f} MB left.")
+
+    async def _evict(self, db, stored_bytes: int) -> List[Tuple[int, int]]:
+        """
+        Deletes the least recently used payloads until `stored_bytes` is down to the
+        eviction target. Returns the (raw_size, stored_size) of every deleted payload.
+        """
+        target = int(self.max_bytes * self.EVICTION_TARGET)
+        evicted_ids, evicted = [], []
+        async with db.execute(
+            "SELECT id, raw_size, stored_size FROM match_payloads ORDER BY last_access, id"
+        ) as cursor:
+            async for payload_id, raw_size, stored_size in cursor:
+                if stored_bytes <= target:
+                    break
+                evicted_ids.append((payload_id,))
+                evicted.append((raw_size, stored_size))
+                stored_bytes -= stored_size
+
+        await db.executemany("DELETE FROM match_payloads WHERE id = ?", evicted_ids)
+        return evicted
+
+    def get_stats(self) -> dict:
+        return {
+            "payloads": self.payloads,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
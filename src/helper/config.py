@@ -32,6 +32,41 @@ class Config:
         azuracast_station_name (str): The name of the AzuraCast station.
         azuracast_api_url (str): The URL of the AzuraCast API.
         azuracast_api_key (str): The API key for the AzuraCast API.
+        battleball_storage_engine (str): The battleball storage engine, sqlite or memory.
+        battleball_db_path (str): The path to the battleball SQLite database.
+        battleball_write_behind (bool): Whether worker writes go through the write-behind stage.
+        battleball_write_behind_max_pending (int): Write intents that can wait before the worker blocks.
+        battleball_write_behind_batch_size (int): Write intents committed together at most.
+        battleball_write_behind_interval_ms (int): Longest wait before pending write intents are committed.
+        battleball_full_crawl (bool): Whether the worker pages through every match ID instead of stopping at its history head.
+        match_payload_db_path (str): The path to the SQLite file storing raw match payloads.
+        match_payload_max_mb (int): Compressed megabytes of match payloads kept before evicting, 0 disables the store.
+        habbo_api_http2 (bool): Whether Habbo API clients negotiate HTTP/2.
+        habbo_api_max_connections (int): Open connections each Habbo API client keeps at most.
+        habbo_api_max_keepalive_connections (int): Idle connections each Habbo API client keeps alive.
+        habbo_api_keepalive_expiry (float): Seconds an idle Habbo API connection stays open.
+        habbo_proxy_max_failures (int): Consecutive failures before a proxy is ejected.
+        habbo_proxy_cooldown_seconds (float): How long a proxy stays ejected the first time.
+        habbo_proxy_max_cooldown_seconds (float): Longest cooldown after repeated ejections.
+        habbo_api_rate (float): Habbo API requests per second the rate limiter starts from.
+        habbo_api_min_rate (float): Lowest rate the limiter backs off to.
+        habbo_api_max_rate (float): Highest rate the limiter grows to.
+        habbo_api_burst (int): Requests that can go out at once after an idle period.
+        habbo_api_concurrency_per_proxy (int): Match fetches kept in flight for each proxy.
+        habbo_identity_cache_size (int): Resolved bouncerPlayerIds kept in memory.
+        habbo_identity_cache_ttl_seconds (float): Seconds a resolved bouncerPlayerId stays in memory.
+        habbo_single_flight_ttl_seconds (float): Seconds a shared Habbo lookup result is reused, 0 only shares in-flight requests.
+        habbo_negative_cache_size (int): Unknown users and missing matches remembered in memory.
+        habbo_negative_cache_ttl_seconds (float): Seconds an unknown user or missing match is answered without a request.
+        habbo_api_hedging (bool): Whether slow match fetches are duplicated through another proxy.
+        habbo_api_hedge_percentile (float): Rolling latency percentile after which a match fetch is duplicated.
+        habbo_api_hedge_budget_percent (float): Most duplicates sent, as a percentage of all Habbo requests.
+        habbo_api_interactive_reserved_percent (float): Share of Habbo requests reserved for interactive lookups.
+        habbo_api_manual_reserved_percent (float): Share of Habbo requests reserved for /update jobs.
+        habbo_api_periodic_reserved_percent (float): Share of Habbo requests reserved for the top users refresh.
+        habbo_circuit_failure_threshold (int): Consecutive failed requests to a Habbo host before its circuit opens.
+        habbo_circuit_cooldown_seconds (float): Seconds before the first probe of a failing Habbo host.
+        habbo_circuit_max_cooldown_seconds (float): Longest wait between probes, which double after every failed one.
     """
 
     CONFIG_FILE_PATH = "config.yaml"
@@ -58,6 +93,81 @@ class Config:
         self.battleball_api_update_interval_minutes: int = 45
         self.battleball_api_update_interval_seconds: int = self.battleball_api_update_interval_minutes * 60
 
+        self.battleball_storage_engine: str = self.settings.get(
+            "battleball_storage_engine") or "sqlite"
+        self.battleball_db_path: str = self.settings.get(
+            "battleball_db_path") or "src/database/storage/battleball.db"
+        self.battleball_write_behind: bool = bool(
+            self.settings.get("battleball_write_behind") or False)
+        self.battleball_write_behind_max_pending: int = int(
+            self.settings.get("battleball_write_behind_max_pending") or 1000)
+        self.battleball_write_behind_batch_size: int = int(
+            self.settings.get("battleball_write_behind_batch_size") or 200)
+        self.battleball_write_behind_interval_ms: int = int(
+            self.settings.get("battleball_write_behind_interval_ms") or 250)
+        self.battleball_full_crawl: bool = bool(
+            self.settings.get("battleball_full_crawl") or False)
+        self.match_payload_db_path: str = self.settings.get(
+            "match_payload_db_path") or "src/database/storage/match_payloads.db"
+        match_payload_max_mb = self.settings.get("match_payload_max_mb")
+        self.match_payload_max_mb: int = int(256 if match_payload_max_mb is None else match_payload_max_mb)
+
+        self.habbo_api_http2: bool = self.settings.get("habbo_api_http2") is not False
+        self.habbo_api_max_connections: int = int(
+            self.settings.get("habbo_api_max_connections") or 20)
+        self.habbo_api_max_keepalive_connections: int = int(
+            self.settings.get("habbo_api_max_keepalive_connections") or 10)
+        self.habbo_api_keepalive_expiry: float = float(
+            self.settings.get("habbo_api_keepalive_expiry") or 30)
+        self.habbo_proxy_max_failures: int = int(
+            self.settings.get("habbo_proxy_max_failures") or 3)
+        self.habbo_proxy_cooldown_seconds: float = float(
+            self.settings.get("habbo_proxy_cooldown_seconds") or 60)
+        self.habbo_proxy_max_cooldown_seconds: float = float(
+            self.settings.get("habbo_proxy_max_cooldown_seconds") or 600)
+        self.habbo_api_rate: float = float(
+            self.settings.get("habbo_api_rate") or 5)
+        self.habbo_api_min_rate: float = float(
+            self.settings.get("habbo_api_min_rate") or 0.5)
+        self.habbo_api_max_rate: float = float(
+            self.settings.get("habbo_api_max_rate") or 50)
+        self.habbo_api_burst: int = int(
+            self.settings.get("habbo_api_burst") or 5)
+        self.habbo_api_concurrency_per_proxy: int = int(
+            self.settings.get("habbo_api_concurrency_per_proxy") or 5)
+        self.habbo_identity_cache_size: int = int(
+            self.settings.get("habbo_identity_cache_size") or 1000)
+        self.habbo_identity_cache_ttl_seconds: float = float(
+            self.settings.get("habbo_identity_cache_ttl_seconds") or 86400)
+        habbo_single_flight_ttl_seconds = self.settings.get("habbo_single_flight_ttl_seconds")
+        self.habbo_single_flight_ttl_seconds: float = float(
+            5 if habbo_single_flight_ttl_seconds is None else habbo_single_flight_ttl_seconds)
+        self.habbo_negative_cache_size: int = int(
+            self.settings.get("habbo_negative_cache_size") or 1000)
+        self.habbo_negative_cache_ttl_seconds: float = float(
+            self.settings.get("habbo_negative_cache_ttl_seconds") or 3600)
+        self.habbo_api_hedging: bool = bool(
+            self.settings.get("habbo_api_hedging") or False)
+        self.habbo_api_hedge_percentile: float = float(
+            self.settings.get("habbo_api_hedge_percentile") or 95)
+        self.habbo_api_hedge_budget_percent: float = float(
+            self.settings.get("habbo_api_hedge_budget_percent") or 5)
+        habbo_api_interactive_reserved_percent = self.settings.get("habbo_api_interactive_reserved_percent")
+        self.habbo_api_interactive_reserved_percent: float = float(
+            20 if habbo_api_interactive_reserved_percent is None else habbo_api_interactive_reserved_percent)
+        habbo_api_manual_reserved_percent = self.settings.get("habbo_api_manual_reserved_percent")
+        self.habbo_api_manual_reserved_percent: float = float(
+            30 if habbo_api_manual_reserved_percent is None else habbo_api_manual_reserved_percent)
+        habbo_api_periodic_reserved_percent = self.settings.get("habbo_api_periodic_reserved_percent")
+        self.habbo_api_periodic_reserved_percent: float = float(
+            10 if habbo_api_periodic_reserved_percent is None else habbo_api_periodic_reserved_percent)
+        self.habbo_circuit_failure_threshold: int = int(
+            self.settings.get("habbo_circuit_failure_threshold") or 10)
+        self.habbo_circuit_cooldown_seconds: float = float(
+            self.settings.get("habbo_circuit_cooldown_seconds") or 15)
+        self.habbo_circuit_max_cooldown_seconds: float = float(
+            self.settings.get("habbo_circuit_max_cooldown_seconds") or 300)
+
         self.rainbow_line_gif: str = "https://i.imgur.com/mnydyND.gif"
         self.app_logo: str = self.settings.get("app_logo", "")
         self.app_url: str = self.settings.get("app_url", "")
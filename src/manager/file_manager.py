@@ -28,6 +28,45 @@ azuracast_station_url: # String, URL to the Azuracast station
 azuracast_station_name: # String, Name of the Azuracast station
 azuracast_api_url: # String, URL to the Azuracast API
 azuracast_api_key: # String, API key of the Azuracast API
+
+# [Battleball]
+battleball_storage_engine: # String, sqlite or memory, memory keeps nothing across restarts (Default: sqlite)
+battleball_db_path: # String, Path to the SQLite database (Default: src/database/storage/battleball.db)
+battleball_write_behind: # Boolean, Commit worker writes in grouped transactions (Default: false)
+battleball_write_behind_max_pending: # Integer, Pending writes before the worker waits (Default: 1000)
+battleball_write_behind_batch_size: # Integer, Most writes committed together (Default: 200)
+battleball_write_behind_interval_ms: # Integer, Longest wait before pending writes are committed (Default: 250)
+battleball_full_crawl: # Boolean, Page through every match ID on each refresh, for backfills (Default: false)
+match_payload_db_path: # String, Path to the SQLite file storing raw match payloads (Default: src/database/storage/match_payloads.db)
+match_payload_max_mb: # Integer, Compressed match payloads kept before the least recently used are evicted, 0 disables the store (Default: 256)
+
+# [Habbo API]
+habbo_api_http2: # Boolean, Negotiate HTTP/2 with the Habbo API (Default: true)
+habbo_api_max_connections: # Integer, Open connections per proxy at most (Default: 20)
+habbo_api_max_keepalive_connections: # Integer, Idle connections kept alive per proxy (Default: 10)
+habbo_api_keepalive_expiry: # Float, Seconds an idle connection stays open (Default: 30)
+habbo_proxy_max_failures: # Integer, Consecutive failures before a proxy is ejected (Default: 3)
+habbo_proxy_cooldown_seconds: # Float, Seconds a proxy stays ejected, doubled on every ejection in a row (Default: 60)
+habbo_proxy_max_cooldown_seconds: # Float, Longest ejection cooldown (Default: 600)
+habbo_api_rate: # Float, Requests per second to start from, adjusted to the API's responses (Default: 5)
+habbo_api_min_rate: # Float, Lowest requests per second after backing off (Default: 0.5)
+habbo_api_max_rate: # Float, Highest requests per second while the API is healthy (Default: 50)
+habbo_api_burst: # Integer, Requests sent at once after an idle period (Default: 5)
+habbo_api_concurrency_per_proxy: # Integer, Match fetches kept in flight per proxy, or in total without proxies (Default: 5)
+habbo_identity_cache_size: # Integer, Resolved bouncerPlayerIds kept in memory (Default: 1000)
+habbo_identity_cache_ttl_seconds: # Float, Seconds a resolved bouncerPlayerId stays in memory (Default: 86400)
+habbo_single_flight_ttl_seconds: # Float, Seconds a shared Habbo lookup result is reused, 0 only shares requests in flight (Default: 5)
+habbo_negative_cache_size: # Integer, Unknown users and missing matches remembered in memory (Default: 1000)
+habbo_negative_cache_ttl_seconds: # Float, Seconds an unknown user or missing match is answered without a request (Default: 3600)
+habbo_api_hedging: # Boolean, Duplicate slow match fetches through another proxy, first answer wins (Default: false)
+habbo_api_hedge_percentile: # Float, Rolling latency percentile after which a match fetch is duplicated (Default: 95)
+habbo_api_hedge_budget_percent: # Float, Most duplicates sent, as a percentage of all Habbo requests (Default: 5)
+habbo_api_interactive_reserved_percent: # Float, Share of Habbo requests reserved for interactive lookups like /keko (Default: 20)
+habbo_api_manual_reserved_percent: # Float, Share of Habbo requests reserved for /update jobs (Default: 30)
+habbo_api_periodic_reserved_percent: # Float, Share of Habbo requests reserved for the top users refresh (Default: 10)
+habbo_circuit_failure_threshold: # Integer, Consecutive failed requests to a Habbo host before its circuit opens (Default: 10)
+habbo_circuit_cooldown_seconds: # Float, Seconds before the first probe of a failing Habbo host (Default: 15)
+habbo_circuit_max_cooldown_seconds: # Float, Longest wait between probes, which double after every failed one (Default: 300)
 """
 
 
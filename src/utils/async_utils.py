@@ -0,0 +1,98 @@
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def sliding_window(
+    func: Callable[[T], Awaitable[R]], items: Union[Iterable[T], AsyncIterable[T]], concurrency: int
+) -> AsyncIterator[R]:
+    """
+    Runs `func` over `items` with up to `concurrency` calls in flight, starting the next
+    call as soon as any finishes, and yields results as they complete. Unlike fixed
+    batches, one slow call only holds up its own slot.
+
+    `items` can also be an async iterable, like a paged API listing. Its next item is
+    awaited alongside the calls in flight, so results keep coming while it loads, and
+    it is closed when the window stops.
+
+    Args:
+        func (Callable): The coroutine function to call for each item.
+        items (Iterable | AsyncIterable): The items, consumed lazily as slots free up.
+        concurrency (int): The number of calls kept in flight.
+
+    Yields:
+        The results of `func`, in completion order.
+    """
+    if isinstance(items, AsyncIterable):
+        window = _sliding_window_async(func, items.__aiter__(), concurrency)
+        try:
+            async for result in window:
+                yield result
+        finally:
+            await window.aclose()
+        return
+
+    items = iter(items)
+    pending = set()
+    try:
+        while True:
+            for item in items:
+                pending.add(asyncio.ensure_future(func(item)))
+                if len(pending) >= concurrency:
+                    break
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # The caller stopped early or failed: don't leave calls running behind it
+        for task in pending:
+            task.cancel()
+
+
+async def _next_item(items: AsyncIterator[T]) -> Tuple[bool, Optional[T]]:
+    try:
+        return True, await items.__anext__()
+    except StopAsyncIteration:
+        return False, None
+
+
+async def _sliding_window_async(
+    func: Callable[[T], Awaitable[R]], items: AsyncIterator[T], concurrency: int
+) -> AsyncIterator[R]:
+    pending = set()
+    pull = None  # The task loading the next item, while a slot is free
+    exhausted = False
+    try:
+        while True:
+            if pull is None and not exhausted and len(pending) < concurrency:
+                pull = asyncio.ensure_future(_next_item(items))
+            if not pending and pull is None:
+                return
+
+            done, _ = await asyncio.wait(pending | {pull} - {None}, return_when=asyncio.FIRST_COMPLETED)
+            if pull in done:
+                done.discard(pull)
+                has_item, item = pull.result()
+                pull = None
+                if has_item:
+                    pending.add(asyncio.ensure_future(func(item)))
+                else:
+                    exhausted = True
+
+            pending -= done
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pull is not None:
+            # The source can't be closed while the pull is still running it
+            pull.cancel()
+            await asyncio.wait({pull})
+        if hasattr(items, "aclose"):
+            await items.aclose()
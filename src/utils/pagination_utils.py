@@ -0,0 +1,44 @@
+import json
+import base64
+from typing import List, Union
+
+CursorValue = Union[int, str]
+
+
+def encode_cursor(*values: CursorValue) -> str:
+    """
+    Packs the sort key of the last returned row into an opaque, URL-safe cursor.
+
+    Args:
+        *values: The sort key values, followed by the position of the row.
+
+    Returns:
+        str: The encoded cursor.
+    """
+    payload = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[CursorValue]:
+    """
+    Unpacks a cursor created by `encode_cursor`.
+
+    Args:
+        cursor (str): The encoded cursor.
+        size (int): The number of values the cursor must hold.
+
+    Returns:
+        list: The values that were packed into the cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or holds the wrong number of values.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Malformed cursor: {e}") from e
+
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(value, int) for value in values):
+        raise ValueError("Malformed cursor")
+    return values
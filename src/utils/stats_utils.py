@@ -0,0 +1,11 @@
+from typing import Iterable, Optional
+
+
+def percentile(samples: Iterable[float], q: float) -> Optional[float]:
+    """
+    Returns the `q` percentile (0-100) of the samples by nearest rank, or None without samples.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    return ordered[min(int(len(ordered) * q / 100), len(ordered) - 1)]
@@ -53,6 +53,8 @@ class BattleballPanelView(discord.ui.View):
                     f"{self.config.abajo_icon} **{position}**. {username} (Added by: <@{discord_id}>)")
 
         queue_message = "**Current Queue:**\n"
+        if self.battleball_worker.paused:
+            queue_message += f"{self.config.abajo_icon} The Habbo API is unavailable, updates are paused until it recovers.\n"
         for line in queue_display:
             if len(queue_message) + len(line) > 1900:
                 queue_message += "..."
@@ -0,0 +1,83 @@
+import asyncio
+from src.database.models.battleball import Match
+from src.database.engine.sqlite_engine import SQLiteBattleballStorage, HOT_QUERIES
+
+
+def run_with_storage(tmp_path, check):
+    async def main():
+        storage = SQLiteBattleballStorage(str(tmp_path / "battleball.db"))
+        await storage.initialize()
+        try:
+            return await check(storage)
+        finally:
+            await storage.close()
+
+    return asyncio.run(main())
+
+
+def test_hot_queries_are_indexed(tmp_path):
+    async def check(storage):
+        return await storage.get_unindexed_steps()
+
+    assert run_with_storage(tmp_path, check) == {}
+
+
+def test_engine_reads_run_indexed_plans(tmp_path):
+    """
+    Traces the statements the read methods actually send, so the plans checked are
+    those of the real queries rather than of copies.
+    """
+    async def check(storage):
+        statements = []
+        for reader in storage.pool._readers:
+            await reader.set_trace_callback(statements.append)
+
+        user_id = await storage.get_user_id("player0")
+        await storage.get_user_identity(user_id or 0)
+        await storage.get_history_head(user_id or 0)
+        await storage.get_leaderboard(10)
+        await storage.seek_leaderboard(10, offset=10)
+        await storage.seek_leaderboard(10, after=(100, 5))
+        await storage.get_queue(10)
+        await storage.seek_queue(10, offset=10)
+        await storage.seek_queue(10, after=5)
+        await storage.get_next_in_queue()
+        await storage.get_match_ids(1)
+        await storage.get_unprocessed_match_ids(1, ["a", "b"])
+
+        for reader in storage.pool._readers:
+            await reader.set_trace_callback(None)
+
+        declared_scans = {scan for _, _, scans in HOT_QUERIES.values() for scan in scans}
+        unindexed = {}
+        for statement in statements:
+            plan = await storage.pool.reader().execute_fetchall(f"EXPLAIN QUERY PLAN {statement}")
+            steps = [
+                row[3] for row in plan
+                if row[3] not in declared_scans and not storage.is_indexed_step(row[3])
+            ]
+            if steps:
+                unindexed[statement] = steps
+        return statements, unindexed
+
+    statements, unindexed = run_with_storage(tmp_path, check)
+    assert len(statements) == 12
+    assert unindexed == {}
+
+
+def test_sorts_and_table_scans_are_flagged():
+    assert not SQLiteBattleballStorage.is_indexed_step("USE TEMP B-TREE FOR ORDER BY")
+    assert not SQLiteBattleballStorage.is_indexed_step("SCAN matches")
+    assert not SQLiteBattleballStorage.is_indexed_step("SCAN queue")
+    assert not SQLiteBattleballStorage.is_indexed_step("SCAN (subquery-2)")
+    assert SQLiteBattleballStorage.is_indexed_step("SEARCH queue USING INTEGER PRIMARY KEY (rowid>?)")
+
+
+def test_unprocessed_match_ids_keep_candidate_order(tmp_path):
+    async def check(storage):
+        await storage.add_user("player0")
+        user_id = await storage.get_user_id("player0")
+        await storage.record_matches(user_id, [Match(match_id="m2", user_id=user_id, game_score=1, ranked=True)])
+        return await storage.get_unprocessed_match_ids(user_id, ["m5", "m1", "m2", "m4", "m3"])
+
+    assert run_with_storage(tmp_path, check) == ["m5", "m1", "m4", "m3"]